@@ -13,8 +13,10 @@ from persistence.models import Document
 from persistence.session import get_db, SessionLocal
 from services.app_lifespan import get_vector_store_service
 from services.ingest.file_handler import FileHandler
+from services.ingest.processor import clear_parent_cache
 from core.settings import settings
-from core.state import processing_status, currently_processing_doc_id
+from core import state
+from core.state import processing_status
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +37,7 @@ async def list_documents(db: Session = Depends(get_db)):
             "collection_name": doc.collection_name,
             "query_enabled": doc.query_enabled,
             "pickle_path": doc.pickle_path,
-            "is_actively_processing": currently_processing_doc_id == doc.id
+            "is_actively_processing": state.currently_processing_doc_id == doc.id
         }
         for doc in docs
     ]
@@ -57,7 +59,7 @@ async def get_document(doc_id: int, db: Session = Depends(get_db)):
         "collection_name": doc.collection_name,
         "query_enabled": doc.query_enabled,
         "pickle_path": doc.pickle_path,
-        "is_actively_processing": currently_processing_doc_id == doc.id
+        "is_actively_processing": state.currently_processing_doc_id == doc.id
     }
 
 
@@ -68,12 +70,20 @@ async def upload_document(file: UploadFile = File(...), db: Session = Depends(ge
     try:
         file_path = FileHandler.save_upload(file.file, file.filename, settings.upload_dir)
 
-        db_document = Document(
-            filename=file.filename,
-            file_path=file_path,
-            processed=False
-        )
-        db.add(db_document)
+        # Same filename overwrites the file on disk, so re-queue the existing row
+        db_document = db.query(Document).filter(Document.filename == file.filename).first()
+        if db_document:
+            db_document.file_path = file_path
+            db_document.processed = False
+            db_document.num_chunks = 0
+            db_document.processing_started_at = None
+        else:
+            db_document = Document(
+                filename=file.filename,
+                file_path=file_path,
+                processed=False
+            )
+            db.add(db_document)
         db.commit()
         db.refresh(db_document)
 
@@ -122,7 +132,9 @@ async def stream_processing_status(doc_id: int, db: Session = Depends(get_db)):
                 finally:
                     db_session.close()
                 if current_status and current_status != last_status:
-                    yield {"event": "progress", "data": json.dumps(current_status)}
+                    payload = dict(current_status)
+                    payload["timestamp"] = datetime.fromtimestamp(payload["timestamp"]).isoformat()
+                    yield {"event": "progress", "data": json.dumps(payload)}
                     last_status = current_status.copy()
                 elif not current_status:
                     yield {
@@ -159,6 +171,7 @@ async def reprocess_document(doc_id: int, db: Session = Depends(get_db)):
         raise HTTPException(400, "File not found")
 
     doc.processed = False
+    doc.processing_started_at = None
     db.commit()
 
     from services.ingest.worker import get_worker
@@ -199,6 +212,7 @@ async def delete_document(doc_id: int, db: Session = Depends(get_db)):
         logger.warning(f"Collection deletion failed: {exc}")
 
     try:
+        clear_parent_cache(doc.pickle_path)
         FileHandler.delete_file(doc.pickle_path)
         FileHandler.delete_file(doc.file_path)
     except Exception as exc:
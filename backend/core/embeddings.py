@@ -1,9 +1,14 @@
 import hashlib
 import logging
 import math
+import os
 import re
+import sqlite3
+import threading
 from collections import Counter, OrderedDict
 from typing import List, Dict, Any, Optional
+import numpy as np
+import xxhash
 from sentence_transformers import SentenceTransformer
 import torch
 
@@ -24,8 +29,8 @@ def get_optimal_device() -> str:
     return 'cpu'
 
 
-def _make_key(text: str) -> str:
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
+def _make_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
 
 
 class LRUCache:
@@ -35,24 +40,28 @@ class LRUCache:
         self.max_size = max_size
         self.hits = 0
         self.misses = 0
+        # Shared by chat requests, the ingest worker and its prefetch thread
+        self._lock = threading.Lock()
 
-    def get(self, text: str) -> Optional[List[float]]:
+    def get(self, text: str) -> Optional[Any]:
         key = _make_key(text)
-        if key in self.cache:
-            self.hits += 1
-            self.cache.move_to_end(key)
-            return self.cache[key]
-        self.misses += 1
-        return None
-
-    def put(self, text: str, embedding: List[float]) -> None:
+        with self._lock:
+            if key in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                return self.cache[key]
+            self.misses += 1
+            return None
+
+    def put(self, text: str, embedding: Any) -> None:
         key = _make_key(text)
-        if key in self.cache:
-            self.cache.move_to_end(key)
-        else:
-            if len(self.cache) >= self.max_size:
-                self.cache.popitem(last=False)
-            self.cache[key] = embedding
+        with self._lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            else:
+                if len(self.cache) >= self.max_size:
+                    self.cache.popitem(last=False)
+                self.cache[key] = embedding
 
     def get_stats(self) -> Dict[str, Any]:
         total = self.hits + self.misses
@@ -66,57 +75,122 @@ class LRUCache:
         }
 
 
+class PersistentEmbeddingCache:
+    """SQLite-backed embedding store keyed by (sha256 of text, model).
+
+    Vectors are stored as raw float32 bytes. Survives restarts, so
+    re-ingesting a document only encodes chunks whose text changed.
+    """
+
+    _QUERY_BATCH = 500
+
+    def __init__(self, path: str, model_name: str, dimension: int):
+        self.model_name = model_name
+        self.dimension = dimension
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "hash TEXT NOT NULL, model TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (hash, model))"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        text_hashes = {text: self._hash(text) for text in texts}
+        hashes = list(set(text_hashes.values()))
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(hashes), self._QUERY_BATCH):
+                batch = hashes[start:start + self._QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embedding_cache WHERE model = ? AND hash IN ({placeholders})",
+                    (self.model_name, *batch)
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    if vector.shape[0] == self.dimension:
+                        found[text_hash] = vector
+
+        return {text: found[text_hash] for text, text_hash in text_hashes.items() if text_hash in found}
+
+    def put_many(self, texts: List[str], embeddings: np.ndarray) -> None:
+        rows = [
+            (self._hash(text), self.model_name, np.asarray(embedding, dtype=np.float32).tobytes())
+            for text, embedding in zip(texts, embeddings)
+        ]
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO embedding_cache (hash, model, vector) VALUES (?, ?, ?)", rows
+                )
+                self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning(f"⚠️  [EMBEDDING] Failed to persist {len(rows)} embeddings: {exc}")
+
+
+_TOKEN_RE = re.compile(r'[a-zäöüß]{3,}')
+
+
 def tokenize(text: str) -> List[str]:
-    text = text.lower()
-    tokens = re.findall(r'\b[a-zA-ZäöüÄÖÜß]+\b', text)
-    return [t for t in tokens if len(t) > 2]
+    return _TOKEN_RE.findall(text.lower())
 
 
 class SparseEmbedding:
-    def __init__(self, vocab_size: int = 30000):
+    def __init__(self, vocab_size: int = 32768):
+        if vocab_size <= 0 or vocab_size & (vocab_size - 1):
+            raise ValueError(f"vocab_size must be a power of two, got {vocab_size}")
         self.vocab_size = vocab_size
+        self._mask = vocab_size - 1
 
     def _hash_token(self, token: str) -> int:
-        return hash(token) % self.vocab_size
+        return xxhash.xxh3_64_intdigest(token) & self._mask
 
     def embed(self, text: str) -> Dict[str, Any]:
         tokens = tokenize(text)
         if not tokens:
             return {"indices": [], "values": []}
 
-        term_frequencies = Counter(tokens)
         total_tokens = len(tokens)
+        term_frequencies = Counter(tokens)
+        unique_count = len(term_frequencies)
+        digest = xxhash.xxh3_64_intdigest
+        mask = self._mask
+        hashed = np.fromiter(
+            (digest(token) & mask for token in term_frequencies),
+            dtype=np.int64,
+            count=unique_count
+        )
+        frequencies = np.fromiter(term_frequencies.values(), dtype=np.float64, count=unique_count)
 
-        indices = []
-        values = []
-
-        for token, count in term_frequencies.items():
-            idx = self._hash_token(token)
-            tf_score = 1 + math.log(count) if count > 0 else 0
-            score = tf_score / math.sqrt(total_tokens)
-            indices.append(idx)
-            values.append(float(score))
-
-        sorted_pairs = sorted(zip(indices, values), key=lambda x: x[0])
-
-        deduped = {}
-        for idx, val in sorted_pairs:
-            if idx not in deduped or val > deduped[idx]:
-                deduped[idx] = val
+        # Bucket over the distinct hashes only, so short chunks don't scan a
+        # vocab_size-wide array. Collisions add up their counts per bucket.
+        indices, inverse = np.unique(hashed, return_inverse=True)
+        counts = np.bincount(inverse, weights=frequencies)
+        values = (1.0 + np.log(counts)) / math.sqrt(total_tokens)
 
         return {
-            "indices": list(deduped.keys()),
-            "values": list(deduped.values())
+            "indices": indices.tolist(),
+            "values": values.tolist()
         }
 
 
 class EmbeddingService:
     _instance = None
+    _init_lock = threading.Lock()
 
     @classmethod
     def get_instance(cls) -> "EmbeddingService":
         if cls._instance is None:
-            cls._instance = cls()
+            with cls._init_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
 
     def __init__(self):
@@ -127,21 +201,42 @@ class EmbeddingService:
 
         import time
         load_start = time.time()
+        model_kwargs = {"file_name": settings.embedding_model_file} if settings.embedding_model_file else None
         self.model = SentenceTransformer(
             settings.embedding_model,
             device=device,
-            cache_folder=settings.models_cache_dir
+            cache_folder=settings.models_cache_dir,
+            backend=settings.embedding_backend,
+            model_kwargs=model_kwargs
         )
+        if settings.embedding_backend == "torch" and settings.embedding_fp16 and device == 'cuda':
+            self.model.half()
+            logger.info(f"   → Precision: FP16")
         load_time = time.time() - load_start
 
         self.dimension = self.model.get_sentence_embedding_dimension()
-        self.sparse_model = SparseEmbedding(vocab_size=30000)
+        self.sparse_model = SparseEmbedding(vocab_size=32768)
         self.cache = LRUCache(max_size=settings.embedding_cache_size)
+        self.sparse_cache = LRUCache(max_size=settings.embedding_cache_size)
+        self.persistent_cache = self._open_persistent_cache()
 
         logger.info(f"✅ [EMBEDDING] Model loaded in {load_time:.2f}s")
         logger.info(f"   → Embedding dimension: {self.dimension}")
         logger.info(f"   → Cache size: {settings.embedding_cache_size} entries")
 
+    def _open_persistent_cache(self) -> Optional[PersistentEmbeddingCache]:
+        if not settings.embedding_persistent_cache:
+            return None
+        model_id = settings.embedding_model
+        if settings.embedding_model_file:
+            model_id = f"{model_id}:{settings.embedding_model_file}"
+        try:
+            os.makedirs(settings.data_dir, exist_ok=True)
+            return PersistentEmbeddingCache(settings.embedding_cache_path, model_id, self.dimension)
+        except sqlite3.Error as exc:
+            logger.warning(f"⚠️  [EMBEDDING] Persistent cache unavailable: {exc}")
+            return None
+
     def warmup(self):
         logger.info(f"🔥 [EMBEDDING] Warming up model...")
         import time
@@ -154,35 +249,56 @@ class EmbeddingService:
         warmup_time = time.time() - warmup_start
         logger.info(f"✅ [EMBEDDING] Warmup completed in {warmup_time:.2f}s")
 
-    def embed_text(self, text: str) -> List[float]:
+    def embed_text(self, text: str) -> np.ndarray:
         cached = self.cache.get(text)
         if cached is not None:
             logger.debug(f"   [CACHE HIT] Embedding retrieved from cache")
             return cached
 
-        embedding = self.model.encode(text).tolist()
+        embedding = np.asarray(self.model.encode(text, convert_to_numpy=True), dtype=np.float32)
         self.cache.put(text, embedding)
         return embedding
 
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        embeddings = []
+    def embed_texts(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
         uncached_texts = []
         uncached_indices = []
 
         for i, text in enumerate(texts):
             cached = self.cache.get(text)
             if cached is not None:
-                embeddings.append(cached)
+                embeddings[i] = cached
             else:
-                embeddings.append(None)
                 uncached_texts.append(text)
                 uncached_indices.append(i)
 
+        if uncached_texts and self.persistent_cache is not None:
+            stored = self.persistent_cache.get_many(uncached_texts)
+            if stored:
+                remaining_texts = []
+                remaining_indices = []
+                for text, idx in zip(uncached_texts, uncached_indices):
+                    vector = stored.get(text)
+                    if vector is not None:
+                        embeddings[idx] = vector
+                        self.cache.put(text, embeddings[idx].copy())
+                    else:
+                        remaining_texts.append(text)
+                        remaining_indices.append(idx)
+                logger.debug(f"   [DISK CACHE] {len(uncached_texts) - len(remaining_texts)} embeddings loaded from disk")
+                uncached_texts, uncached_indices = remaining_texts, remaining_indices
+
         if uncached_texts:
-            new_embeddings = self.model.encode(uncached_texts).tolist()
-            for idx, embedding in zip(uncached_indices, new_embeddings):
-                embeddings[idx] = embedding
-                self.cache.put(texts[idx], embedding)
+            embeddings[uncached_indices] = self.model.encode(
+                uncached_texts,
+                batch_size=batch_size or settings.embedding_batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True
+            )
+            for idx in uncached_indices:
+                self.cache.put(texts[idx], embeddings[idx].copy())
+            if self.persistent_cache is not None:
+                self.persistent_cache.put_many(uncached_texts, embeddings[uncached_indices])
 
         return embeddings
 
@@ -190,7 +306,13 @@ class EmbeddingService:
         return self.cache.get_stats()
 
     def embed_sparse(self, text: str) -> Dict[str, Any]:
-        return self.sparse_model.embed(text)
+        cached = self.sparse_cache.get(text)
+        if cached is not None:
+            return cached
+
+        embedding = self.sparse_model.embed(text)
+        self.sparse_cache.put(text, embedding)
+        return embedding
 
     def embed_sparse_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
         return [self.sparse_model.embed(text) for text in texts]
@@ -1,3 +1,4 @@
+import functools
 import logging
 from langchain_anthropic import ChatAnthropic
 from langchain_ollama import ChatOllama
@@ -7,29 +8,49 @@ from .settings import settings
 logger = logging.getLogger(__name__)
 
 
-def create_llm(streaming: bool = False, max_tokens: int = None, temperature: float = None, **kwargs):
+def create_llm(
+        streaming: bool = False,
+        max_tokens: int = None,
+        temperature: float = None,
+        purpose: str = "chat",
+        **kwargs
+):
     provider = settings.get_active_provider()
+    model = settings.get_llm_model(purpose)
     temp = temperature or settings.llm_temperature
     max_tok = max_tokens or settings.llm_max_tokens
     timeout = kwargs.pop("timeout", settings.llm_timeout)
 
-    logger.info("=" * 80)
-    logger.info("🤖 LLM Factory - Creating LLM Instance")
-    logger.info("=" * 80)
-    logger.info(f"   • Provider: {provider}")
-    logger.info(f"   • Model: {settings.llm_model}")
-    logger.info(f"   • Streaming: {streaming}")
-    logger.info(f"   • Temperature: {temp}")
-    logger.info(f"   • Max Tokens: {max_tok}")
-    logger.info(f"   • Timeout: {timeout}s")
+    if kwargs:
+        # Extra kwargs are not necessarily hashable, so build without the cache
+        return _build_llm(provider, model, purpose, streaming, temp, max_tok, timeout, **kwargs)
+    return _create_llm_cached(provider, model, purpose, streaming, temp, max_tok, timeout)
+
+
+@functools.lru_cache(maxsize=16)
+def _create_llm_cached(provider: str, model: str, purpose: str, streaming: bool, temp: float, max_tok: int,
+                       timeout: float):
+    return _build_llm(provider, model, purpose, streaming, temp, max_tok, timeout)
+
+
+def _build_llm(provider: str, model: str, purpose: str, streaming: bool, temp: float, max_tok: int,
+               timeout: float, **kwargs):
+    logger.info(f"🤖 LLM Factory - Creating {provider} instance (model: {model}, purpose: {purpose})")
+    logger.debug("=" * 80)
+    logger.debug(f"   • Provider: {provider}")
+    logger.debug(f"   • Model: {model} ({purpose})")
+    logger.debug(f"   • Streaming: {streaming}")
+    logger.debug(f"   • Temperature: {temp}")
+    logger.debug(f"   • Max Tokens: {max_tok}")
+    logger.debug(f"   • Timeout: {timeout}s")
 
     try:
         if provider == "anthropic":
-            logger.info(
+            logger.debug(
                 f"   • API Key: {'***' + settings.anthropic_api_key[-4:] if settings.anthropic_api_key else 'NOT SET'}")
 
             llm = ChatAnthropic(
-                model=settings.llm_model,
+                model=model,
                 anthropic_api_key=settings.anthropic_api_key,
                 temperature=temp,
                 max_tokens=max_tok,
@@ -37,14 +58,14 @@ def create_llm(streaming: bool = False, max_tokens: int = None, temperature: flo
                 timeout=timeout,
                 **kwargs
             )
-            logger.info(f"✅ ChatAnthropic instance created successfully")
+            logger.debug(f"✅ ChatAnthropic instance created successfully")
 
         elif provider == "openai":
-            logger.info(
+            logger.debug(
                 f"   • API Key: {'***' + settings.openai_api_key[-4:] if settings.openai_api_key else 'NOT SET'}")
 
             llm = ChatOpenAI(
-                model=settings.llm_model,
+                model=model,
                 openai_api_key=settings.openai_api_key,
                 temperature=temp,
                 max_tokens=max_tok,
@@ -52,35 +73,35 @@ def create_llm(streaming: bool = False, max_tokens: int = None, temperature: flo
                 timeout=timeout,
                 **kwargs
             )
-            logger.info(f"✅ ChatOpenAI instance created successfully")
+            logger.debug(f"✅ ChatOpenAI instance created successfully")
 
         else:
-            logger.info(f"   • Base URL: {settings.ollama_base_url}")
-            logger.info(
+            logger.debug(f"   • Base URL: {settings.ollama_base_url}")
+            logger.debug(
                 f"   • Target: http://{settings.ollama_base_url.replace('http://', '').replace('https://', '')}/api/chat")
 
             if kwargs:
-                logger.info(f"   • Additional kwargs: {kwargs}")
+                logger.debug(f"   • Additional kwargs: {kwargs}")
 
             llm = ChatOllama(
-                model=settings.llm_model,
+                model=model,
                 base_url=settings.ollama_base_url,
                 temperature=temp,
                 num_predict=max_tok,
                 **kwargs
             )
-            logger.info(f"✅ ChatOllama instance created successfully")
-            logger.info(f"   → Will request model '{settings.llm_model}' from Ollama")
-            logger.info(f"   → Ensure model is downloaded: docker exec rag-ollama ollama list")
+            logger.debug(f"✅ ChatOllama instance created successfully")
+            logger.debug(f"   → Will request model '{model}' from Ollama")
+            logger.debug(f"   → Ensure model is downloaded: docker exec rag-ollama ollama list")
 
-        logger.info("=" * 80)
+        logger.debug("=" * 80)
         return llm
 
     except Exception as exc:
         logger.error("=" * 80)
         logger.error(f"❌ LLM Factory - Failed to create LLM instance")
         logger.error(f"   • Provider: {provider}")
-        logger.error(f"   • Model: {settings.llm_model}")
+        logger.error(f"   • Model: {model}")
         logger.error(f"   • Error: {type(exc).__name__}: {exc}")
         logger.error("=" * 80)
         raise
\ No newline at end of file
@@ -108,21 +108,28 @@ class RerankerService:
             query: str,
             documents: List[Dict[str, Any]],
             top_k: int = 5,
-            apply_threshold: bool = True
+            apply_threshold: bool = True,
+            reuse_scores: bool = False
     ) -> List[Dict[str, Any]]:
         if not documents:
             return []
 
-        pairs = [(query, doc['text']) for doc in documents]
-        scores = self.model.predict(pairs)
-        scores_normalized = expit(scores)
-        scores_list = [float(s) for s in scores_normalized]
+        # reuse_scores: don't score documents that already carry a rerank_score (same query) again
+        pending = [doc for doc in documents if 'rerank_score' not in doc] if reuse_scores else documents
 
-        logger.debug(f"Reranking: Raw score range [{np.min(scores):.2f}, {np.max(scores):.2f}] "
-                    f"→ Normalized [{np.min(scores_normalized):.3f}, {np.max(scores_normalized):.3f}]")
+        if pending:
+            pairs = [(query, doc['text']) for doc in pending]
+            scores = self.model.predict(pairs)
+            scores_normalized = expit(scores)
 
-        for doc, score in zip(documents, scores_list):
-            doc['rerank_score'] = score
+            logger.debug(f"Reranking {len(pending)}/{len(documents)}: Raw score range "
+                        f"[{np.min(scores):.2f}, {np.max(scores):.2f}] "
+                        f"→ Normalized [{np.min(scores_normalized):.3f}, {np.max(scores_normalized):.3f}]")
+
+            for doc, score in zip(pending, scores_normalized):
+                doc['rerank_score'] = float(score)
+
+        scores_list = [doc['rerank_score'] for doc in documents]
 
         reranked = sorted(documents, key=lambda x: x['rerank_score'], reverse=True)
 
@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     ollama_base_url: str = "http://ollama:11434"
     llm_model: str = "llama2"
+    metadata_llm_model: str = ""  # Empty: use llm_model
     llm_temperature: float = 0.0
     llm_max_tokens: int = 4096
     llm_timeout: float = 30.0
@@ -23,11 +24,22 @@ class Settings(BaseSettings):
     embedding_model: str = "intfloat/multilingual-e5-base"
     embedding_batch_size: int = 32
     embedding_cache_size: int = 10000
+    parent_doc_cache_size: int = 2048
+    embedding_persistent_cache: bool = True
+    embedding_fp16: bool = True
+    embedding_backend: str = "torch"  # Options: "torch", "onnx", "openvino"
+    embedding_model_file: str = ""
     reranker_model: str = "BAAI/bge-reranker-v2-m3"
     reranker_batch_size: int = 16
 
     use_docling_parser: bool = True
     use_llm_metadata_extraction: bool = False
+    metadata_batch_size: int = 4
+    force_llm_metadata: bool = False
+    metadata_llm_threshold: int = 3
+    metadata_extraction_char_limit: int = 3000
+    ingest_claim_timeout: int = 1800
+    pdf_page_workers: int = 4
 
     docling_use_vlm: bool = False
     docling_vlm_backend: str = "transformers"
@@ -53,13 +65,17 @@ class Settings(BaseSettings):
     neighbor_expansion_window: int = 4
     top_k_retrieval: int = 20
     top_k_rerank: int = 6
+    rag_speculative_retry: bool = False
 
     query_expansion_cache_size: int = 1000
     query_expansion_cache_ttl: int = 3600
+    query_expansion_semantic_cache: bool = False
+    query_expansion_similarity_threshold: float = 0.98
 
     zotero_library_id: str = ""
     zotero_library_type: str = "user"
     zotero_api_key: str = ""
+    zotero_download_concurrency: int = 4
 
     data_dir: str = "/app/data"
     models_cache_dir: str = "/app/models"
@@ -79,6 +95,14 @@ class Settings(BaseSettings):
     def pickle_dir(self) -> str:
         return os.path.join(self.data_dir, "pickles")
 
+    @property
+    def metadata_cache_dir(self) -> str:
+        return os.path.join(self.data_dir, "metadata_cache")
+
+    @property
+    def embedding_cache_path(self) -> str:
+        return os.path.join(self.data_dir, "embedding_cache.sqlite")
+
     def get_active_provider(self) -> str:
         if self.llm_provider and self.llm_provider.lower() in ["anthropic", "openai", "ollama"]:
             return self.llm_provider.lower()
@@ -90,6 +114,11 @@ class Settings(BaseSettings):
         else:
             return "ollama"
 
+    def get_llm_model(self, purpose: str = "chat") -> str:
+        if purpose == "metadata" and self.metadata_llm_model:
+            return self.metadata_llm_model
+        return self.llm_model
+
     def get_vlm_model_spec(self) -> str:
         if self.docling_vlm_backend == "mlx":
             return "GRANITEDOCLING_MLX"
@@ -99,6 +128,7 @@ class Settings(BaseSettings):
         os.makedirs(self.data_dir, exist_ok=True)
         os.makedirs(self.upload_dir, exist_ok=True)
         os.makedirs(self.pickle_dir, exist_ok=True)
+        os.makedirs(self.metadata_cache_dir, exist_ok=True)
         os.makedirs(self.models_cache_dir, exist_ok=True)
 
 
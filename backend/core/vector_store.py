@@ -1,6 +1,8 @@
 import logging
-import uuid
-from typing import List, Dict, Any, Set
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -16,6 +18,40 @@ from .embeddings import EmbeddingService
 
 logger = logging.getLogger(__name__)
 
+MAX_SEARCH_WORKERS = 16
+COLLECTION_EXISTS_TTL = 30.0
+UPSERT_BATCH_SIZE = 512
+METADATA_CACHE_TTL = 300.0
+
+# Module-level so that the ingest worker, Zotero sync and chat instances share invalidation
+_METADATA_CACHE: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_metadata_cache_lock = threading.Lock()
+
+
+def _get_cached_metadata(collection_name: str) -> Optional[List[Dict[str, Any]]]:
+    with _metadata_cache_lock:
+        entry = _METADATA_CACHE.get(collection_name)
+        if entry is None:
+            return None
+        cached_at, chunks = entry
+        if time.monotonic() - cached_at >= METADATA_CACHE_TTL:
+            del _METADATA_CACHE[collection_name]
+            return None
+        return chunks
+
+
+def _cache_metadata(collection_name: str, chunks: List[Dict[str, Any]]) -> None:
+    # Empty results are not cached: the collection may still be indexing
+    if not chunks:
+        return
+    with _metadata_cache_lock:
+        _METADATA_CACHE[collection_name] = (time.monotonic(), chunks)
+
+
+def _evict_metadata(collection_name: str) -> None:
+    with _metadata_cache_lock:
+        _METADATA_CACHE.pop(collection_name, None)
+
 
 class VectorStoreError(Exception):
     pass
@@ -36,6 +72,8 @@ class VectorStoreService:
         )
         self.embedding_service = embedding_service
         self.collection_prefix = settings.qdrant_collection_prefix
+        self._exists_cache: Dict[str, float] = {}
+        self._exists_ttl = COLLECTION_EXISTS_TTL
 
     def collection_name_for_document(self, document_id: int) -> str:
         return f"{self.collection_prefix}{document_id}"
@@ -43,10 +81,17 @@ class VectorStoreService:
     def collection_exists(self, collection_name: str) -> bool:
         if not collection_name:
             return False
+
+        checked_at = self._exists_cache.get(collection_name)
+        if checked_at is not None and time.monotonic() - checked_at < self._exists_ttl:
+            return True
+
         try:
             self.client.get_collection(collection_name)
+            self._exists_cache[collection_name] = time.monotonic()
             return True
         except Exception:
+            self._exists_cache.pop(collection_name, None)
             return False
 
     def delete_collection(self, collection_name: str) -> None:
@@ -58,6 +103,9 @@ class VectorStoreService:
                 logger.info(f"Deleted collection: {collection_name}")
         except Exception as exc:
             logger.warning(f"Could not delete collection {collection_name}: {exc}")
+        finally:
+            self._exists_cache.pop(collection_name, None)
+            _evict_metadata(collection_name)
 
     def ensure_collection(self, collection_name: str) -> None:
         if not collection_name:
@@ -78,7 +126,7 @@ class VectorStoreService:
 
             if not has_dense or not has_sparse:
                 logger.info(f"Recreating collection {collection_name} for hybrid support")
-                self._create_hybrid_collection(collection_name)
+                self._recreate_hybrid_collection(collection_name)
                 return
 
             current_size = None
@@ -92,22 +140,25 @@ class VectorStoreService:
                     f"Recreating collection {collection_name} due to dimension change "
                     f"{current_size} -> {self.embedding_service.dimension}"
                 )
-                self._create_hybrid_collection(collection_name)
+                self._recreate_hybrid_collection(collection_name)
 
         except Exception as exc:
             logger.info(f"Creating collection {collection_name}: {exc}")
             self._create_hybrid_collection(collection_name)
 
-    def _create_hybrid_collection(self, collection_name: str) -> None:
-        logger.info(f"Creating hybrid collection with Scalar Quantization: {collection_name}")
-
+    def _recreate_hybrid_collection(self, collection_name: str) -> None:
         if self.collection_exists(collection_name):
             try:
                 self.client.delete_collection(collection_name)
             except Exception as exc:
                 logger.warning(f"Failed to delete existing collection {collection_name}: {exc}")
+            self._exists_cache.pop(collection_name, None)
 
+        self._create_hybrid_collection(collection_name)
 
+    def _create_hybrid_collection(self, collection_name: str) -> None:
+        logger.info(f"Creating hybrid collection with Scalar Quantization: {collection_name}")
+        _evict_metadata(collection_name)
 
         self.client.create_collection(
         collection_name=collection_name,
@@ -130,6 +181,7 @@ class VectorStoreService:
             )
         }
         )
+        self._exists_cache[collection_name] = time.monotonic()
         self._create_payload_indexes(collection_name)
 
     def _create_payload_indexes(self, collection_name: str) -> None:
@@ -161,6 +213,7 @@ class VectorStoreService:
             self.client.delete_collection(collection_name)
         except Exception:
             pass
+        self._exists_cache.pop(collection_name, None)
         self._create_hybrid_collection(collection_name)
 
     def cleanup_orphaned_collections(self, valid_collections: Set[str]) -> None:
@@ -180,6 +233,8 @@ class VectorStoreService:
                     self.client.delete_collection(name)
                 except Exception as exc:
                     logger.warning(f"Failed to delete collection {name}: {exc}")
+                self._exists_cache.pop(name, None)
+                _evict_metadata(name)
 
     def build_collection_map(self, documents: List[Any]) -> Dict[int, str]:
         mapping: Dict[int, str] = {}
@@ -199,7 +254,8 @@ class VectorStoreService:
             doc_id: int,
             chunks: List[Dict[str, Any]],
             collection_name: str,
-            document_name: str = None
+            document_name: str = None,
+            progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> None:
         logger.info(f"🔢 [VECTOR STORE] Starting embedding for {len(chunks)} chunks")
         logger.info(f"   → Document ID: {doc_id}")
@@ -209,6 +265,8 @@ class VectorStoreService:
         if not collection_name:
             raise VectorStoreError(f"Cannot add documents: empty collection_name for doc_id {doc_id}")
 
+        _evict_metadata(collection_name)
+
         try:
             logger.info(f"   → Ensuring collection exists...")
             self.ensure_collection(collection_name)
@@ -217,51 +275,56 @@ class VectorStoreService:
             logger.error(f"❌ Failed to ensure collection {collection_name}: {exc}", exc_info=True)
             raise VectorStoreError(f"Failed to ensure collection {collection_name}: {exc}")
 
-        points = []
-        embedding_times = []
+        points: List[PointStruct] = []
+        total_chunks = len(chunks)
 
         try:
-            import time
-            logger.info(f"   → Generating embeddings for {len(chunks)} chunks...")
+            logger.info(f"   → Generating embeddings for {total_chunks} chunks...")
+            embed_start = time.time()
 
-            for idx, chunk in enumerate(chunks):
-                chunk_start = time.time()
+            texts = [chunk['text'] for chunk in chunks]
 
-                dense_embedding = self.embedding_service.embed_text(chunk['text'])
-                sparse_embedding = self.embedding_service.embed_sparse(chunk['text'])
-                chunk_id = chunk.get('chunk_id', idx)
+            # Repeated boilerplate (headers, footers) is embedded once and scattered back.
+            unique_positions: Dict[str, int] = {}
+            positions = [unique_positions.setdefault(text, len(unique_positions)) for text in texts]
+            unique_texts = list(unique_positions)
+            if len(unique_texts) < total_chunks:
+                logger.info(f"   → {total_chunks - len(unique_texts)} duplicate chunk texts skipped for embedding")
 
-                chunk_time = time.time() - chunk_start
-                embedding_times.append(chunk_time)
-                if idx == 0 or (idx + 1) % 10 == 0 or idx == len(chunks) - 1:
-                    avg_time = sum(embedding_times) / len(embedding_times)
-                    logger.info(f"   → Embedded chunk {idx + 1}/{len(chunks)} ({chunk_time:.3f}s, avg: {avg_time:.3f}s)")
+            dense_embeddings = self.embedding_service.embed_texts(unique_texts)[positions]
+            unique_sparse = self.embedding_service.embed_sparse_batch(unique_texts)
+            sparse_embeddings = [unique_sparse[position] for position in positions]
 
-                point = PointStruct(
-                    id=str(uuid.uuid4()),
+            point_struct = PointStruct
+            sparse_vector = SparseVector
+
+            points = [
+                point_struct(
+                    id=idx,
                     vector={
-                        "dense": dense_embedding,
-                        "sparse": SparseVector(
+                        "dense": dense_embeddings[idx].tolist(),
+                        "sparse": sparse_vector(
                             indices=sparse_embedding["indices"],
                             values=sparse_embedding["values"]
                         )
                     },
                     payload={
                         'doc_id': doc_id,
-                        'chunk_id': chunk_id,
-                        'text': chunk['text'],
+                        'chunk_id': chunk.get('chunk_id', idx),
+                        'text': texts[idx],
                         'parent_id': chunk.get('parent_id'),
                         'document_name': document_name or chunk.get('document_name', ''),
                         'section': chunk.get('section', ''),
                         'position': chunk.get('position', 'middle'),
                         'chunk_index': idx,
-                        'total_chunks': len(chunks)
+                        'total_chunks': total_chunks
                     }
                 )
-                points.append(point)
+                for idx, (chunk, sparse_embedding) in enumerate(zip(chunks, sparse_embeddings))
+            ]
 
-            total_time = sum(embedding_times)
-            avg_time = total_time / len(embedding_times) if embedding_times else 0
+            total_time = time.time() - embed_start
+            avg_time = total_time / total_chunks if total_chunks else 0
             logger.info(f"   ✓ All embeddings generated: {len(points)} points in {total_time:.2f}s (avg: {avg_time:.3f}s/chunk)")
 
         except Exception as exc:
@@ -270,9 +333,8 @@ class VectorStoreService:
 
         try:
             logger.info(f"   → Upserting {len(points)} points to Qdrant...")
-            import time
             upsert_start = time.time()
-            self.client.upsert(collection_name=collection_name, points=points)
+            self._upsert_points(collection_name, points, progress_callback)
             upsert_time = time.time() - upsert_start
             logger.info(f"✅ [VECTOR STORE] Successfully stored {len(points)} vectors in {upsert_time:.2f}s")
             logger.info(f"   → Collection: {collection_name}")
@@ -284,8 +346,8 @@ class VectorStoreService:
                     f"Collection {collection_name} had schema issues (vector/size error), recreating collection"
                 )
                 try:
-                    self._create_hybrid_collection(collection_name)
-                    self.client.upsert(collection_name=collection_name, points=points)
+                    self._recreate_hybrid_collection(collection_name)
+                    self._upsert_points(collection_name, points, progress_callback)
                     logger.info(f"Successfully added {len(points)} points after recreating collection {collection_name}")
                 except Exception as retry_exc:
                     logger.error(
@@ -300,6 +362,21 @@ class VectorStoreService:
                 )
                 raise VectorStoreError(f"Failed to add documents to {collection_name}: {exc}")
 
+    def _upsert_points(
+            self,
+            collection_name: str,
+            points: List[PointStruct],
+            progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> None:
+        total = len(points)
+        for start in range(0, total, UPSERT_BATCH_SIZE):
+            self.client.upsert(
+                collection_name=collection_name,
+                points=points[start:start + UPSERT_BATCH_SIZE]
+            )
+            if progress_callback:
+                progress_callback(min(start + UPSERT_BATCH_SIZE, total), total)
+
     def document_exists(self, collection_name: str) -> bool:
         if not self.collection_exists(collection_name):
             return False
@@ -314,58 +391,100 @@ class VectorStoreService:
         self.delete_collection(collection_name)
 
     def search(self, query: str, doc_collection_map: Dict[int, str], top_k: int = 20) -> List[Dict[str, Any]]:
-        if not doc_collection_map:
-            return []
+        return self.search_many([query], doc_collection_map, top_k=top_k)[0]
 
-        dense_embedding = self.embedding_service.embed_text(query)
-        sparse_embedding = self.embedding_service.embed_sparse(query)
-        combined_results: List[Dict[str, Any]] = []
+    def search_many(
+            self,
+            queries: List[str],
+            doc_collection_map: Dict[int, str],
+            top_k: int = 20
+    ) -> List[List[Dict[str, Any]]]:
+        """Run several hybrid searches at once; results keep the order of ``queries``."""
+        if not doc_collection_map or not queries:
+            return [[] for _ in queries]
 
         per_collection_limit = max(top_k, 5)
+        # Embeddings in the calling thread, only the Qdrant calls run in parallel
+        requests = [self._hybrid_request(query, per_collection_limit) for query in queries]
+
+        max_workers = min(MAX_SEARCH_WORKERS, len(doc_collection_map) * len(queries))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="qdrant-search") as executor:
+            futures = [
+                [
+                    executor.submit(
+                        self._query_one,
+                        doc_id,
+                        collection_name,
+                        dense_embedding,
+                        prefetch,
+                        per_collection_limit
+                    )
+                    for doc_id, collection_name in doc_collection_map.items()
+                ]
+                for dense_embedding, prefetch in requests
+            ]
 
-        for doc_id, collection_name in doc_collection_map.items():
-            if not self.collection_exists(collection_name):
-                continue
-            try:
-                from qdrant_client.models import Fusion
-
-                results = self.client.query_points(
-                    collection_name=collection_name,
-                    prefetch=[
-                        Prefetch(query=dense_embedding, using="dense", limit=per_collection_limit * 2),
-                        Prefetch(
-                            query=SparseVector(
-                                indices=sparse_embedding["indices"],
-                                values=sparse_embedding["values"]
-                            ),
-                            using="sparse",
-                            limit=per_collection_limit * 2
-                        )
-                    ],
-                    query=dense_embedding,
-                    using="dense",
-                    limit=per_collection_limit
-                )
-            except Exception as exc:
-                logger.warning("Query failed for collection %s: %s", collection_name, exc)
-                continue
+            results: List[List[Dict[str, Any]]] = []
+            for query_futures in futures:
+                combined_results = [hit for future in query_futures for hit in future.result()]
+                combined_results.sort(key=lambda item: item['score'], reverse=True)
+                results.append(combined_results[:top_k])
 
-            for hit in results.points:
-                combined_results.append({
-                    'text': hit.payload['text'],
-                    'doc_id': hit.payload.get('doc_id', doc_id),
-                    'chunk_id': hit.payload['chunk_id'],
-                    'parent_id': hit.payload.get('parent_id'),
-                    'document_name': hit.payload.get('document_name', ''),
-                    'section': hit.payload.get('section', ''),
-                    'position': hit.payload.get('position', ''),
-                    'chunk_index': hit.payload.get('chunk_index'),
-                    'total_chunks': hit.payload.get('total_chunks'),
-                    'score': hit.score
-                })
-
-        combined_results.sort(key=lambda item: item['score'], reverse=True)
-        return combined_results[:top_k]
+        return results
+
+    def _hybrid_request(self, query: str, per_collection_limit: int) -> Tuple[List[float], List[Prefetch]]:
+        dense_embedding = self.embedding_service.embed_text(query).tolist()
+        sparse_embedding = self.embedding_service.embed_sparse(query)
+        prefetch = [
+            Prefetch(query=dense_embedding, using="dense", limit=per_collection_limit * 2),
+            Prefetch(
+                query=SparseVector(
+                    indices=sparse_embedding["indices"],
+                    values=sparse_embedding["values"]
+                ),
+                using="sparse",
+                limit=per_collection_limit * 2
+            )
+        ]
+        return dense_embedding, prefetch
+
+    def _query_one(
+            self,
+            doc_id: int,
+            collection_name: str,
+            dense_embedding: List[float],
+            prefetch: List[Prefetch],
+            limit: int
+    ) -> List[Dict[str, Any]]:
+        if not self.collection_exists(collection_name):
+            return []
+        try:
+            results = self.client.query_points(
+                collection_name=collection_name,
+                prefetch=prefetch,
+                query=dense_embedding,
+                using="dense",
+                limit=limit
+            )
+        except Exception as exc:
+            logger.warning("Query failed for collection %s: %s", collection_name, exc)
+            return []
+
+        return [
+            {
+                'text': hit.payload['text'],
+                'doc_id': hit.payload.get('doc_id', doc_id),
+                'chunk_id': hit.payload['chunk_id'],
+                'parent_id': hit.payload.get('parent_id'),
+                'document_name': hit.payload.get('document_name', ''),
+                'section': hit.payload.get('section', ''),
+                'position': hit.payload.get('position', ''),
+                'chunk_index': hit.payload.get('chunk_index'),
+                'total_chunks': hit.payload.get('total_chunks'),
+                'score': hit.score
+            }
+            for hit in results.points
+        ]
 
     def search_dense_only(
             self,
@@ -376,7 +495,7 @@ class VectorStoreService:
         if not self.collection_exists(collection_name):
             return []
 
-        query_embedding = self.embedding_service.embed_text(query)
+        query_embedding = self.embedding_service.embed_text(query).tolist()
         results = self.client.search(
             collection_name=collection_name,
             query_vector=("dense", query_embedding),
@@ -419,42 +538,55 @@ class VectorStoreService:
         metadata_chunks: List[Dict[str, Any]] = []
 
         for doc_id, collection_name in doc_collection_map.items():
-            if not self.collection_exists(collection_name):
-                continue
-
-            try:
-                results, _ = self.client.scroll(
-                    collection_name=collection_name,
-                    scroll_filter=Filter(
-                        must=[
-                            FieldCondition(
-                                key="section",
-                                match=MatchValue(value="Document Metadata")
-                            )
-                        ]
-                    ),
-                    limit=2,
-                    with_payload=True
-                )
-            except Exception as exc:
-                logger.warning(f"Failed to retrieve metadata for doc {doc_id}: {exc}")
-                continue
+            cached = _get_cached_metadata(collection_name)
+            if cached is None:
+                cached = self._fetch_metadata_chunks(doc_id, collection_name)
+                if cached is None:
+                    continue
+                _cache_metadata(collection_name, cached)
 
-            for point in results:
-                metadata_chunks.append({
-                    'text': point.payload['text'],
-                    'doc_id': doc_id,
-                    'chunk_id': point.payload.get('chunk_id', 0),
-                    'parent_id': point.payload.get('parent_id', 0),
-                    'document_name': point.payload.get('document_name', ''),
-                    'section': point.payload.get('section', ''),
-                    'position': point.payload.get('position', ''),
-                    'score': 0.0,
-                    'is_metadata_injection': True
-                })
+            metadata_chunks.extend(dict(chunk) for chunk in cached)
 
         return metadata_chunks
 
+    def _fetch_metadata_chunks(self, doc_id: int, collection_name: str) -> Optional[List[Dict[str, Any]]]:
+        if not self.collection_exists(collection_name):
+            return None
+
+        try:
+            results, _ = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=Filter(
+                    must=[
+                        FieldCondition(
+                            key="section",
+                            match=MatchValue(value="Document Metadata")
+                        )
+                    ]
+                ),
+                limit=2,
+                with_payload=True,
+                with_vectors=False
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to retrieve metadata for doc {doc_id}: {exc}")
+            return None
+
+        return [
+            {
+                'text': point.payload['text'],
+                'doc_id': doc_id,
+                'chunk_id': point.payload.get('chunk_id', 0),
+                'parent_id': point.payload.get('parent_id', 0),
+                'document_name': point.payload.get('document_name', ''),
+                'section': point.payload.get('section', ''),
+                'position': point.payload.get('position', ''),
+                'score': 0.0,
+                'is_metadata_injection': True
+            }
+            for point in results
+        ]
+
     @staticmethod
     def _hit_to_dict(hit) -> Dict[str, Any]:
         return {
@@ -0,0 +1,67 @@
+"""documents: processing claim column, pending and unique filename indexes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    # Fresh databases get the full table from create_all in init_db
+    if not inspector.has_table("documents"):
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("documents")}
+    indexes = {index["name"]: index for index in inspector.get_indexes("documents")}
+
+    if "processing_started_at" not in columns:
+        op.add_column("documents", sa.Column("processing_started_at", sa.DateTime(), nullable=True))
+
+    if "ix_documents_pending" not in indexes:
+        op.create_index(
+            "ix_documents_pending",
+            "documents",
+            ["id"],
+            postgresql_where=sa.text("processed = false"),
+        )
+
+    filename_index = indexes.get("ix_documents_filename")
+    if filename_index is not None and filename_index.get("unique"):
+        return
+
+    duplicates = conn.execute(sa.text(
+        "SELECT filename FROM documents GROUP BY filename HAVING COUNT(*) > 1 LIMIT 5"
+    )).scalars().all()
+    if duplicates:
+        logger.warning(
+            f"⚠️  Duplicate document filenames {duplicates}, keeping non-unique filename index"
+        )
+        if filename_index is None:
+            op.create_index("ix_documents_filename", "documents", ["filename"])
+        return
+
+    if filename_index is not None:
+        op.drop_index("ix_documents_filename", table_name="documents")
+    op.create_index("ix_documents_filename", "documents", ["filename"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_filename", table_name="documents")
+    op.create_index("ix_documents_filename", "documents", ["filename"])
+    op.drop_index("ix_documents_pending", table_name="documents")
+    op.drop_column("documents", "processing_started_at")
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import String, Text, ForeignKey, func
+from sqlalchemy import Index, String, Text, ForeignKey, func, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -34,19 +34,28 @@ class Message(Base):
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # The worker only queries unprocessed documents
+        Index("ix_documents_pending", "id", postgresql_where=text("processed = false")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    filename: Mapped[str] = mapped_column(String(255))
+    filename: Mapped[str] = mapped_column(String(255), unique=True, index=True)
     file_path: Mapped[str] = mapped_column(String(512))
     pickle_path: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
     uploaded_at: Mapped[datetime] = mapped_column(default=func.now())
     processed: Mapped[bool] = mapped_column(default=False)
     num_chunks: Mapped[int] = mapped_column(default=0)
     query_enabled: Mapped[bool] = mapped_column(default=True)
+    processing_started_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
 
     @property
     def collection_name(self) -> str:
+        return self.collection_name_for(self.id)
+
+    @staticmethod
+    def collection_name_for(doc_id: Optional[int]) -> str:
         prefix = "doc_"
-        if self.id is None:
+        if doc_id is None:
             return f"{prefix}pending"
-        return f"{prefix}{self.id}"
\ No newline at end of file
+        return f"{prefix}{doc_id}"
\ No newline at end of file
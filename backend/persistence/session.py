@@ -8,6 +8,7 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def init_db():
+    # Changes to existing tables live in migrations/versions (alembic upgrade head)
     Base.metadata.create_all(bind=engine)
 
 
@@ -1,4 +1,5 @@
 import logging
+import threading
 from contextlib import asynccontextmanager
 from typing import Optional
 
@@ -22,26 +23,29 @@ logger = logging.getLogger(__name__)
 def _sync_documents_with_qdrant(vector_store) -> None:
     db = SessionLocal()
     try:
-        documents = db.query(Document).all()
-        synced_count = 0
+        # Load only the needed columns, no ORM instances
+        documents = db.query(Document.id, Document.filename, Document.processed).all()
+        missing_ids: list[int] = []
         valid_collections: set[str] = set()
 
         logger.info(f"🔄 Syncing {len(documents)} documents with Qdrant...")
 
-        for doc in documents:
-            collection_name = doc.collection_name
-            if collection_name:
-                valid_collections.add(collection_name)
+        for doc_id, filename, processed in documents:
+            collection_name = Document.collection_name_for(doc_id)
+            valid_collections.add(collection_name)
 
-            if doc.processed and not vector_store.document_exists(collection_name):
+            if processed and not vector_store.document_exists(collection_name):
                 logger.warning(
-                    f"⚠️  Document {doc.id} ({doc.filename}) missing in Qdrant, marking as unprocessed"
+                    f"⚠️  Document {doc_id} ({filename}) missing in Qdrant, marking as unprocessed"
                 )
-                doc.processed = False
-                doc.num_chunks = 0
-                synced_count += 1
+                missing_ids.append(doc_id)
 
+        synced_count = len(missing_ids)
         if synced_count > 0:
+            db.query(Document).filter(Document.id.in_(missing_ids)).update(
+                {Document.processed: False, Document.num_chunks: 0, Document.processing_started_at: None},
+                synchronize_session=False
+            )
             db.commit()
             logger.info(f"🔄 Synced {synced_count} documents with Qdrant")
 
@@ -116,12 +120,21 @@ async def lifespan(app: FastAPI):
     rag_service = RAGService(vector_store_service, reranker_service, doc_processor)
     logger.info(f"   ✅ RAG service ready")
 
-    metadata_extractor = MetadataExtractor(use_llm=settings.use_llm_metadata_extraction)
+    metadata_extractor = MetadataExtractor(
+        use_llm=settings.use_llm_metadata_extraction,
+        cache_dir=settings.metadata_cache_dir
+    )
     logger.info(f"   ✅ Metadata extractor ready")
 
     document_pipeline = DocumentPipelineService(vector_store_service, metadata_extractor)
     logger.info(f"   ✅ Document pipeline ready")
 
+    if settings.use_docling_parser:
+        from services.ingest.file_handler import DoclingVLMConverter
+
+        threading.Thread(target=DoclingVLMConverter.preload, name="docling-preload", daemon=True).start()
+        logger.info(f"   ⏳ Docling converter loading in background")
+
     logger.info("🔄 Syncing documents with Qdrant...")
     _sync_documents_with_qdrant(vector_store_service)
 
@@ -162,6 +175,10 @@ async def lifespan(app: FastAPI):
     await worker.stop()
     logger.info("   ✅ Document worker stopped")
 
+    from services.ingest.file_handler import shutdown_page_pool
+    shutdown_page_pool()
+    logger.info("   ✅ PDF page workers stopped")
+
     logger.info("=" * 80)
     logger.info("✅ Shutdown complete")
     logger.info("=" * 80)
@@ -1,21 +1,204 @@
+import contextlib
+import functools
 import logging
+import mmap
+import multiprocessing
 import os
 import shutil
+import threading
 import time
-from typing import BinaryIO, Dict, Any, Optional
-
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import VlmPipelineOptions
-from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling.pipeline.vlm_pipeline import VlmPipeline
-from docling.datamodel import vlm_model_specs
-from pypdf import PdfReader
-from docx import Document as DocxDocument
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Any, Iterator, List, Optional, Tuple
 
 from core.settings import settings
 
 logger = logging.getLogger(__name__)
 
+_SEP = "=" * 80
+
+
+@functools.lru_cache(maxsize=1)
+def _load_pdf_reader():
+    from pypdf import PdfReader
+    return PdfReader
+
+
+# Below this size the mmap setup doesn't pay off
+_MMAP_MIN_SIZE = 256 * 1024
+
+
+def _open_pdf_reader(file_path: str):
+    stat = os.stat(file_path)
+    return _open_pdf(file_path, stat.st_mtime, stat.st_size)
+
+
+# pypdf readers share a stream position and lazy object caches; the ingest worker and
+# its prefetch thread may read the same file, so every use of a cached reader is serialized
+_pdf_locks: Dict[str, threading.Lock] = {}
+_pdf_locks_guard = threading.Lock()
+
+
+@contextlib.contextmanager
+def _pdf_reader(file_path: str) -> Iterator[Any]:
+    with _pdf_locks_guard:
+        lock = _pdf_locks.setdefault(file_path, threading.Lock())
+    with lock:
+        yield _open_pdf_reader(file_path)
+
+
+# Text, metadata and first pages of an upload share one reader (parse the xref only once)
+@functools.lru_cache(maxsize=4)
+def _open_pdf(file_path: str, mtime: float, size: int):
+    PdfReader = _load_pdf_reader()
+    if size < _MMAP_MIN_SIZE:
+        return PdfReader(file_path)
+
+    # PdfReader reads paths fully into a BytesIO; the map lives as long as the reader
+    with open(file_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return PdfReader(mapped)
+
+
+# Starting the worker processes only pays off from this page count on
+_PARALLEL_PAGE_THRESHOLD = 8
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def _page_worker_count() -> int:
+    return max(1, min(settings.pdf_page_workers, os.cpu_count() or 1))
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _page_pool
+    # Reached from the ingest worker and its prefetch thread
+    if _page_pool is None:
+        with _page_pool_lock:
+            if _page_pool is None:
+                # spawn instead of fork: the parent process holds Torch and DB threads
+                _page_pool = ProcessPoolExecutor(
+                    max_workers=_page_worker_count(),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _page_pool
+
+
+def shutdown_page_pool() -> None:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown(wait=False, cancel_futures=True)
+            _page_pool = None
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    with _pdf_reader(file_path) as reader:
+        return [text for i in range(start, stop) if (text := reader.pages[i].extract_text())]
+
+
+@functools.lru_cache(maxsize=1)
+def _load_fitz():
+    try:
+        import fitz
+        return fitz
+    except ImportError:
+        logger.info("ℹ️  [EXTRACT] PyMuPDF not installed, using PyPDF")
+        return None
+
+
+def _fitz_text_flags(fitz) -> int:
+    # Text spans only, no images; ligatures are expanded (ﬁ → fi) so tokenizers match them
+    return fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+
+@functools.lru_cache(maxsize=1)
+def _load_docx_document():
+    from docx import Document as DocxDocument
+    return DocxDocument
+
+
+@functools.lru_cache(maxsize=1)
+def _load_lxml_etree():
+    from lxml import etree
+    return etree
+
+_EXTRACT_CACHE_SIZE = 8
+_EXTRACT_CACHE_MAX_CHARS = 8_000_000
+_EXTRACT_CACHE: "OrderedDict[Tuple[str, float, int], str]" = OrderedDict()
+_extract_cache_chars = 0
+# Guards both extraction caches; the ingest worker and its prefetch thread use them concurrently
+_extract_cache_lock = threading.Lock()
+
+
+def _extract_cache_key(file_path: str) -> Optional[Tuple[str, float, int]]:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return file_path, stat.st_mtime, stat.st_size
+
+
+def _get_cached_text(key: Optional[Tuple[str, float, int]]) -> Optional[str]:
+    if key is None:
+        return None
+    with _extract_cache_lock:
+        if key not in _EXTRACT_CACHE:
+            return None
+        _EXTRACT_CACHE.move_to_end(key)
+        return _EXTRACT_CACHE[key]
+
+
+def _cache_text(key: Optional[Tuple[str, float, int]], text: str) -> None:
+    global _extract_cache_chars
+    if key is None or len(text) > _EXTRACT_CACHE_MAX_CHARS:
+        return
+    with _extract_cache_lock:
+        previous = _EXTRACT_CACHE.pop(key, None)
+        if previous is not None:
+            _extract_cache_chars -= len(previous)
+        _EXTRACT_CACHE[key] = text
+        _extract_cache_chars += len(text)
+        while len(_EXTRACT_CACHE) > _EXTRACT_CACHE_SIZE or _extract_cache_chars > _EXTRACT_CACHE_MAX_CHARS:
+            _, evicted = _EXTRACT_CACHE.popitem(last=False)
+            _extract_cache_chars -= len(evicted)
+
+
+def _evict_cached_text(file_path: str) -> None:
+    global _extract_cache_chars
+    with _extract_cache_lock:
+        for key in [k for k in _EXTRACT_CACHE if k[0] == file_path]:
+            _extract_cache_chars -= len(_EXTRACT_CACHE.pop(key))
+        for key in [k for k in _PDF_METADATA_CACHE if k[0] == file_path]:
+            del _PDF_METADATA_CACHE[key]
+
+
+# PDF metadata from the full-text pass, so extract_metadata does not parse the file again
+_PDF_METADATA_CACHE: "OrderedDict[Tuple[str, float, int], Dict[str, Any]]" = OrderedDict()
+
+
+def _cache_pdf_metadata(key: Optional[Tuple[str, float, int]], metadata: Dict[str, Any]) -> None:
+    if key is None:
+        return
+    with _extract_cache_lock:
+        _PDF_METADATA_CACHE[key] = metadata
+        _PDF_METADATA_CACHE.move_to_end(key)
+        while len(_PDF_METADATA_CACHE) > _EXTRACT_CACHE_SIZE:
+            _PDF_METADATA_CACHE.popitem(last=False)
+
+
+def _get_cached_pdf_metadata(key: Optional[Tuple[str, float, int]]) -> Optional[Dict[str, Any]]:
+    if key is None:
+        return None
+    with _extract_cache_lock:
+        return _PDF_METADATA_CACHE.get(key)
+
+
+# Uploads are usually several MB; copyfileobj's 64 KiB default causes needless syscalls
+_UPLOAD_COPY_BUFSIZE = 1024 * 1024
+
 
 class FileProcessingError(Exception):
     pass
@@ -33,15 +216,22 @@ class DoclingVLMConverter:
     _instance: Optional["DoclingVLMConverter"] = None
     _converter = None
     _disabled = False
+    _init_lock = threading.Lock()
 
     @classmethod
     def get_instance(cls) -> Optional["DoclingVLMConverter"]:
         if cls._disabled or not settings.use_docling_parser:
             return None
-        if cls._instance is None:
-            cls._instance = cls()
+        # If the preload is still running, wait here instead of loading a second model
+        with cls._init_lock:
+            if cls._instance is None:
+                cls._instance = cls()
         return cls._instance
 
+    @classmethod
+    def preload(cls) -> None:
+        cls.get_instance()
+
     def __init__(self):
         if DoclingVLMConverter._disabled:
             return
@@ -50,7 +240,14 @@ class DoclingVLMConverter:
         logger.info("🔧 [DOCLING INIT] Initializing Docling converter...")
 
         try:
+            from docling.datamodel.base_models import InputFormat
+            from docling.document_converter import DocumentConverter, PdfFormatOption
+
             if settings.docling_use_vlm:
+                from docling.datamodel import vlm_model_specs
+                from docling.datamodel.pipeline_options import VlmPipelineOptions
+                from docling.pipeline.vlm_pipeline import VlmPipeline
+
                 logger.info("   → Mode: VLM Pipeline (GraniteDocling)")
                 logger.info("   → Warning: Very slow on CPU (~15-20s per page)")
 
@@ -119,26 +316,27 @@ class DoclingVLMConverter:
         convert_start = time.time()
 
         try:
-            try:
-                reader = PdfReader(file_path)
-                num_pages = len(reader.pages)
-                file_size = os.path.getsize(file_path)
-                logger.info("=" * 80)
-                logger.info(f"📄 [DOCLING] Starting conversion: {filename}")
-                logger.info(f"   • File size: {file_size:,} bytes ({file_size / 1024:.1f} KB)")
-                logger.info(f"   • Total pages: {num_pages}")
-
-                if settings.docling_use_vlm:
-                    est_time = num_pages * 15
-                    logger.info(f"   • Estimated time: ~{est_time // 60} min {est_time % 60} sec (VLM on CPU)")
-                else:
-                    est_time = num_pages * 2.5
-                    logger.info(f"   • Estimated time: ~{est_time // 60} min {est_time % 60} sec (Standard)")
-
-                logger.info("=" * 80)
-            except FileProcessingError as exc:
-                num_pages = 0
-                logger.info(f"📄 [DOCLING] Converting: {filename}. Unable to read page count: {exc})")
+            num_pages = 0
+            if logger.isEnabledFor(logging.INFO):
+                try:
+                    with _pdf_reader(file_path) as reader:
+                        num_pages = len(reader.pages)
+                    file_size = os.path.getsize(file_path)
+                    logger.info(_SEP)
+                    logger.info(f"📄 [DOCLING] Starting conversion: {filename}")
+                    logger.info(f"   • File size: {file_size:,} bytes ({file_size / 1024:.1f} KB)")
+                    logger.info(f"   • Total pages: {num_pages}")
+
+                    if settings.docling_use_vlm:
+                        est_time = num_pages * 15
+                        logger.info(f"   • Estimated time: ~{est_time // 60} min {est_time % 60} sec (VLM on CPU)")
+                    else:
+                        est_time = num_pages * 2.5
+                        logger.info(f"   • Estimated time: ~{est_time // 60} min {est_time % 60} sec (Standard)")
+
+                    logger.info(_SEP)
+                except FileProcessingError as exc:
+                    logger.info(f"📄 [DOCLING] Converting: {filename}. Unable to read page count: {exc})")
 
             logger.info("🔄 [DOCLING] Running document converter...")
             logger.info("   → This may take several minutes, please wait...")
@@ -158,7 +356,7 @@ class DoclingVLMConverter:
                 num_tables = len(document.tables)
                 num_pictures = len(document.pictures) if hasattr(document, 'pictures') else 0
 
-                logger.info("=" * 80)
+                logger.info(_SEP)
                 logger.info(f"✅ [DOCLING] Conversion successful!")
                 logger.info(f"   • File: {filename}")
                 logger.info(f"   • Duration: {convert_time:.1f}s ({convert_time / 60:.1f} min)")
@@ -169,7 +367,7 @@ class DoclingVLMConverter:
                 logger.info(f"   • Output: {len(markdown):,} characters")
                 logger.info(f"   • Tables detected: {num_tables}")
                 logger.info(f"   • Pictures: {num_pictures}")
-                logger.info("=" * 80)
+                logger.info(_SEP)
 
                 return markdown
 
@@ -178,11 +376,11 @@ class DoclingVLMConverter:
 
         except Exception as exc:
             convert_time = time.time() - convert_start
-            logger.error("=" * 80)
+            logger.error(_SEP)
             logger.error(f"❌ [DOCLING] Conversion failed after {convert_time:.1f}s")
             logger.error(f"   • File: {filename}")
             logger.error(f"   • Error: {type(exc).__name__}: {exc}")
-            logger.error("=" * 80)
+            logger.error(_SEP)
             return None
 
 
@@ -192,6 +390,12 @@ class PDFExtractor:
         filename = os.path.basename(file_path)
         extraction_start = time.time()
 
+        cache_key = _extract_cache_key(file_path)
+        cached = _get_cached_text(cache_key)
+        if cached is not None:
+            logger.info(f"✅ [EXTRACT] Reusing cached text for {filename} ({len(cached):,} chars)")
+            return cached
+
         if not settings.use_docling_parser:
             logger.info(f"ℹ️  [EXTRACT] Docling disabled, using PyPDF")
         else:
@@ -209,51 +413,52 @@ class PDFExtractor:
                     logger.info(f"✅ [EXTRACT] Docling extraction complete")
                     logger.info(f"   • Duration: {extraction_time:.1f}s")
                     logger.info(f"   • Characters: {len(docling_text):,}")
+                    _cache_text(cache_key, docling_text)
                     return docling_text
 
-        try:
-            logger.info("=" * 80)
-            logger.info(f"📖 [PyPDF] Starting extraction: {filename}")
-
-            reader = PdfReader(file_path)
-            num_pages = len(reader.pages)
-            file_size = os.path.getsize(file_path)
-
-            logger.info(f"   • File size: {file_size:,} bytes ({file_size / 1024:.1f} KB)")
-            logger.info(f"   • Total pages: {num_pages}")
-            logger.info(f"   • Estimated time: ~{num_pages * 0.5:.0f} seconds")
-            logger.info("=" * 80)
+        fitz = _load_fitz()
+        if fitz is not None:
+            try:
+                extracted = PDFExtractor._extract_with_pymupdf(fitz, file_path)
+                _cache_text(cache_key, extracted)
+                return extracted
+            except Exception as exc:
+                logger.warning(f"⚠️  [PyMuPDF] Extraction failed, falling back to PyPDF: {exc}")
 
-            text_parts = []
-            page_start = time.time()
+        log_info = logger.isEnabledFor(logging.INFO)
+        try:
+            with _pdf_reader(file_path) as reader:
+                num_pages = len(reader.pages)
 
-            for page_num, page in enumerate(reader.pages, 1):
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+                if log_info:
+                    file_size = os.path.getsize(file_path)
+                    logger.info(_SEP)
+                    logger.info(f"📖 [PyPDF] Starting extraction: {filename}")
+                    logger.info(f"   • File size: {file_size:,} bytes ({file_size / 1024:.1f} KB)")
+                    logger.info(f"   • Total pages: {num_pages}")
+                    logger.info(f"   • Estimated time: ~{num_pages * 0.5:.0f} seconds")
+                    logger.info(_SEP)
 
-                if page_num % 10 == 0 or page_num == num_pages:
-                    elapsed = time.time() - page_start
-                    avg_time = elapsed / page_num
-                    remaining = (num_pages - page_num) * avg_time
-                    progress = (page_num / num_pages) * 100
+                text_parts = None
+                if num_pages <= _PARALLEL_PAGE_THRESHOLD:
+                    text_parts = PDFExtractor._extract_pages_sequential(reader, num_pages)
 
-                    logger.info(
-                        f"📄 [PyPDF] Progress: {page_num}/{num_pages} pages ({progress:.0f}%) - "
-                        f"ETA: {remaining:.0f}s"
-                    )
+            if text_parts is None:
+                text_parts = PDFExtractor._extract_pages_parallel(file_path, num_pages)
 
             extracted = "\n".join(text_parts)
-            extraction_time = time.time() - extraction_start
 
-            logger.info("=" * 80)
-            logger.info(f"✅ [PyPDF] Extraction complete!")
-            logger.info(f"   • File: {filename}")
-            logger.info(f"   • Duration: {extraction_time:.1f}s")
-            logger.info(f"   • Pages: {num_pages}")
-            logger.info(f"   • Speed: {extraction_time / num_pages:.2f}s per page")
-            logger.info(f"   • Characters: {len(extracted):,}")
-            logger.info("=" * 80)
+            if log_info:
+                extraction_time = time.time() - extraction_start
+                logger.info(_SEP)
+                logger.info(f"✅ [PyPDF] Extraction complete!")
+                logger.info(f"   • File: {filename}")
+                logger.info(f"   • Duration: {extraction_time:.1f}s")
+                logger.info(f"   • Pages: {num_pages}")
+                logger.info(f"   • Speed: {extraction_time / num_pages:.2f}s per page")
+                logger.info(f"   • Characters: {len(extracted):,}")
+                logger.info(_SEP)
+            _cache_text(cache_key, extracted)
             return extracted
 
         except Exception as exc:
@@ -261,23 +466,93 @@ class PDFExtractor:
             logger.error(f"❌ [PyPDF] Extraction failed after {extraction_time:.1f}s: {exc}")
             raise TextExtractionError(f"Failed to extract text from PDF: {exc}")
 
+    @staticmethod
+    def _extract_pages_parallel(file_path: str, num_pages: int) -> List[str]:
+        pool = _get_page_pool()
+        # Contiguous page ranges so each worker parses the file only once
+        chunk_size = -(-num_pages // _page_worker_count())
+        ranges = [(start, min(start + chunk_size, num_pages)) for start in range(0, num_pages, chunk_size)]
+        logger.info(f"📄 [PyPDF] Extracting {num_pages} pages in {len(ranges)} worker processes")
+
+        futures = [pool.submit(_extract_page_range, file_path, start, stop) for start, stop in ranges]
+        return [page_text for future in futures for page_text in future.result()]
+
+    @staticmethod
+    def _extract_pages_sequential(reader, num_pages: int) -> List[str]:
+        text_parts = []
+        log_progress = logger.isEnabledFor(logging.INFO)
+        page_start = time.monotonic()
+
+        for page_num, page in enumerate(reader.pages, 1):
+            page_text = page.extract_text()
+            if page_text:
+                text_parts.append(page_text)
+
+            if log_progress and (page_num % 50 == 0 or page_num == num_pages):
+                elapsed = time.monotonic() - page_start
+                remaining = (num_pages - page_num) * elapsed / page_num
+                logger.info(
+                    "📄 [PyPDF] Progress: %d/%d pages (%.0f%%) - ETA: %.0fs",
+                    page_num, num_pages, page_num / num_pages * 100, remaining
+                )
+
+        return text_parts
+
+    @staticmethod
+    def _extract_with_pymupdf(fitz, file_path: str) -> str:
+        filename = os.path.basename(file_path)
+        extraction_start = time.time()
+
+        with fitz.open(file_path) as doc:
+            num_pages = doc.page_count
+            logger.info(f"📖 [PyMuPDF] Extracting {filename} ({num_pages} pages)")
+            flags = _fitz_text_flags(fitz)
+            text_parts = [text for page in doc if (text := page.get_text("text", flags=flags))]
+
+            pdf_metadata = doc.metadata or {}
+            _cache_pdf_metadata(_extract_cache_key(file_path), {
+                "title": pdf_metadata.get("title") or "",
+                "author": pdf_metadata.get("author") or "",
+                "subject": pdf_metadata.get("subject") or "",
+                "creator": pdf_metadata.get("creator") or "",
+                "producer": pdf_metadata.get("producer") or "",
+                "creation_date": pdf_metadata.get("creationDate") or "",
+                "num_pages": num_pages
+            })
+
+        extracted = "\n".join(text_parts)
+        extraction_time = time.time() - extraction_start
+
+        logger.info(f"✅ [PyMuPDF] Extraction complete!")
+        logger.info(f"   • Duration: {extraction_time:.1f}s")
+        logger.info(f"   • Pages: {num_pages}")
+        logger.info(f"   • Characters: {len(extracted):,}")
+        return extracted
+
     @staticmethod
     def extract_metadata(file_path: str) -> Dict[str, Any]:
+        cached = _get_cached_pdf_metadata(_extract_cache_key(file_path))
+        if cached is not None:
+            logger.info(f"✅ [METADATA] Reusing metadata from text extraction ({cached['num_pages']} pages)")
+            return dict(cached)
+
         try:
             logger.info(f"📋 [METADATA] Extracting PDF metadata...")
-            reader = PdfReader(file_path)
-            metadata = reader.metadata
-
-            if metadata:
-                result = {
-                    "title": metadata.get("/Title", "") or "",
-                    "author": metadata.get("/Author", "") or "",
-                    "subject": metadata.get("/Subject", "") or "",
-                    "creator": metadata.get("/Creator", "") or "",
-                    "producer": metadata.get("/Producer", "") or "",
-                    "creation_date": str(metadata.get("/CreationDate", "")) or "",
-                    "num_pages": len(reader.pages)
-                }
+            with _pdf_reader(file_path) as reader:
+                metadata = reader.metadata
+                result = None
+                if metadata:
+                    result = {
+                        "title": metadata.get("/Title", "") or "",
+                        "author": metadata.get("/Author", "") or "",
+                        "subject": metadata.get("/Subject", "") or "",
+                        "creator": metadata.get("/Creator", "") or "",
+                        "producer": metadata.get("/Producer", "") or "",
+                        "creation_date": str(metadata.get("/CreationDate", "")) or "",
+                        "num_pages": len(reader.pages)
+                    }
+
+            if result:
                 logger.info(f"✅ [METADATA] Extracted: {result.get('num_pages')} pages, "
                             f"title='{result.get('title', 'N/A')}'")
                 return result
@@ -294,29 +569,47 @@ class PDFExtractor:
     ) -> str:
         logger.info(f"📄 [FIRST PAGES] Extracting first {num_pages} pages (max {max_chars} chars)...")
 
-        # Versuche Docling für bessere Qualität
-        docling = DoclingVLMConverter.get_instance()
-        if docling:
-            logger.info("   → Using Docling for first pages...")
-            docling_text = docling.convert(file_path)
-            if docling_text:
-                result = docling_text[:max_chars]
-                logger.info(f"✅ [FIRST PAGES] Extracted {len(result)} chars via Docling")
+        cached = _get_cached_text(_extract_cache_key(file_path))
+        if cached is not None:
+            result = cached[:max_chars]
+            logger.info(f"✅ [FIRST PAGES] Extracted {len(result)} chars from cached full text")
+            return result
+
+        # Docling would convert the whole document; PyMuPDF/PyPDF is enough for the preview
+        fitz = _load_fitz()
+        if fitz is not None:
+            try:
+                text_parts = []
+                total_chars = 0
+
+                with fitz.open(file_path) as doc:
+                    for i in range(min(num_pages, doc.page_count)):
+                        page_text = doc.load_page(i).get_text("text", flags=_fitz_text_flags(fitz))
+                        if page_text:
+                            text_parts.append(page_text)
+                            total_chars += len(page_text)
+                            if total_chars >= max_chars:
+                                break
+
+                result = "".join(text_parts)[:max_chars]
+                logger.info(f"✅ [FIRST PAGES] Extracted {len(result)} chars via PyMuPDF")
                 return result
+            except Exception as exc:
+                logger.warning(f"⚠️  [FIRST PAGES] PyMuPDF failed, falling back to PyPDF: {exc}")
 
         try:
             logger.info("   → Using PyPDF for first pages...")
-            reader = PdfReader(file_path)
             text_parts = []
             total_chars = 0
 
-            for page in reader.pages[:num_pages]:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-                    total_chars += len(page_text)
-                    if total_chars > max_chars:
-                        break
+            with _pdf_reader(file_path) as reader:
+                for i in range(min(num_pages, len(reader.pages))):
+                    page_text = reader.get_page(i).extract_text()
+                    if page_text:
+                        text_parts.append(page_text)
+                        total_chars += len(page_text)
+                        if total_chars >= max_chars:
+                            break
 
             result = "".join(text_parts)[:max_chars]
             logger.info(f"✅ [FIRST PAGES] Extracted {len(result)} chars via PyPDF")
@@ -327,6 +620,9 @@ class PDFExtractor:
             return ""
 
 
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
 class DOCXExtractor:
     @staticmethod
     def extract_text(file_path: str) -> str:
@@ -334,8 +630,12 @@ class DOCXExtractor:
         logger.info(f"📄 [DOCX] Extracting from: {filename}")
 
         try:
-            doc = DocxDocument(file_path)
-            paragraphs = [p.text for p in doc.paragraphs if p.text]
+            try:
+                paragraphs = DOCXExtractor._iter_paragraphs(file_path)
+            except Exception as exc:
+                logger.warning(f"⚠️  [DOCX] Streaming parse failed, using python-docx: {exc}")
+                doc = _load_docx_document()(file_path)
+                paragraphs = [p.text for p in doc.paragraphs if p.text]
             result = "\n".join(paragraphs)
 
             logger.info(f"✅ [DOCX] Extracted {len(result):,} characters from {len(paragraphs)} paragraphs")
@@ -346,6 +646,19 @@ class DOCXExtractor:
             raise TextExtractionError(f"Failed to extract text from DOCX: {exc}")
 
 
+    @staticmethod
+    def _iter_paragraphs(file_path: str) -> List[str]:
+        etree = _load_lxml_etree()
+        paragraphs = []
+        with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as xml:
+            for _, element in etree.iterparse(xml, events=('end',), tag=_W_NS + 'p'):
+                text = ''.join(t.text or '' for t in element.iter(_W_NS + 't'))
+                if text:
+                    paragraphs.append(text)
+                element.clear()
+        return paragraphs
+
+
 class PlainTextExtractor:
     @staticmethod
     def extract_text(file_path: str) -> str:
@@ -353,8 +666,11 @@ class PlainTextExtractor:
         logger.info(f"📄 [TEXT] Reading: {filename}")
 
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                result = f.read()
+            result = Path(file_path).read_bytes().decode('utf-8', 'ignore')
+
+            # Like text mode: normalize line endings
+            if '\r' in result:
+                result = result.replace('\r\n', '\n').replace('\r', '\n')
 
             logger.info(f"✅ [TEXT] Read {len(result):,} characters")
             return result
@@ -363,26 +679,43 @@ class PlainTextExtractor:
             logger.error(f"❌ [TEXT] Read failed: {exc}")
             raise TextExtractionError(f"Failed to read text file: {exc}")
 
+    @staticmethod
+    def extract_prefix(file_path: str, max_chars: int) -> str:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read(max_chars)
+        except Exception as exc:
+            logger.warning(f"⚠️  [TEXT] Prefix read failed: {exc}")
+            return ""
+
+
+_EXTRACTORS = {
+    '.pdf': PDFExtractor.extract_text,
+    '.docx': DOCXExtractor.extract_text,
+    '.txt': PlainTextExtractor.extract_text,
+    '.md': PlainTextExtractor.extract_text,
+}
+
+
+def _file_extension(file_path: str) -> str:
+    return os.path.splitext(file_path)[1].lower()
+
 
 class FileHandler:
-    SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.txt', '.md'}
+    SUPPORTED_EXTENSIONS = frozenset(_EXTRACTORS)
 
     @staticmethod
     def extract_text(file_path: str) -> str:
-        ext = os.path.splitext(file_path)[1].lower()
+        ext = _file_extension(file_path)
         filename = os.path.basename(file_path)
 
         logger.info(f"📂 [FILE HANDLER] Processing: {filename} (type: {ext})")
 
-        if ext == '.pdf':
-            return PDFExtractor.extract_text(file_path)
-        elif ext == '.docx':
-            return DOCXExtractor.extract_text(file_path)
-        elif ext in ['.txt', '.md']:
-            return PlainTextExtractor.extract_text(file_path)
-        else:
+        extractor = _EXTRACTORS.get(ext)
+        if extractor is None:
             logger.error(f"❌ [FILE HANDLER] Unsupported file type: {ext}")
             raise UnsupportedFileTypeError(f"Unsupported file type: {ext}")
+        return extractor(file_path)
 
     @staticmethod
     def extract_pdf_metadata(file_path: str) -> Dict[str, Any]:
@@ -394,10 +727,12 @@ class FileHandler:
             num_pages: int = 2,
             max_chars: int = 3000
     ) -> str:
-        ext = os.path.splitext(file_path)[1].lower()
+        ext = _file_extension(file_path)
 
         if ext == '.pdf':
             return PDFExtractor.extract_first_pages(file_path, num_pages, max_chars)
+        elif ext in ('.txt', '.md'):
+            return PlainTextExtractor.extract_prefix(file_path, max_chars)
         else:
             full_text = FileHandler.extract_text(file_path)
             return full_text[:max_chars]
@@ -410,9 +745,9 @@ class FileHandler:
 
         try:
             with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file, buffer)
+                shutil.copyfileobj(file, buffer, _UPLOAD_COPY_BUFSIZE)
+                file_size = buffer.tell()
 
-            file_size = os.path.getsize(file_path)
             logger.info(f"✅ [UPLOAD] Saved: {file_path} ({file_size:,} bytes)")
             return file_path
 
@@ -422,17 +757,24 @@ class FileHandler:
 
     @staticmethod
     def is_supported(filename: str) -> bool:
-        ext = os.path.splitext(filename)[1].lower()
-        return ext in FileHandler.SUPPORTED_EXTENSIONS
+        return _file_extension(filename) in FileHandler.SUPPORTED_EXTENSIONS
 
     @staticmethod
     def delete_file(file_path: str) -> bool:
+        if not file_path:
+            return False
+
+        _evict_cached_text(file_path)
+        _open_pdf.cache_clear()
+        with _pdf_locks_guard:
+            _pdf_locks.pop(file_path, None)
         try:
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"🗑️  [DELETE] Removed: {file_path}")
-                return True
+            os.remove(file_path)
+        except FileNotFoundError:
             return False
         except Exception as exc:
             logger.warning(f"⚠️  [DELETE] Failed to delete {file_path}: {exc}")
-            return False
\ No newline at end of file
+            return False
+
+        logger.info(f"🗑️  [DELETE] Removed: {file_path}")
+        return True
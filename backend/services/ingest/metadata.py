@@ -1,9 +1,16 @@
+import hashlib
+import json
 import logging
-from typing import Dict, Any, Optional
+import os
+import re
+from typing import Dict, Any, List, Optional, Tuple
 
+from langchain_core.exceptions import OutputParserException
 from langchain_core.messages import SystemMessage, HumanMessage
+from pydantic import BaseModel, Field, ValidationError
 
 from core.llm import create_llm
+from core.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +41,23 @@ Abstract: [abstract text or "Not found"]
 Keywords: [keywords or "Not found"]
 Document Type: [type or "Not found"]"""
 
+_SYSTEM_MSG = SystemMessage(content=METADATA_EXTRACTION_PROMPT)
+
+# Bump when the prompt or parser changes so old cache entries no longer match
+METADATA_PROMPT_VERSION = "2"
+
+STRUCTURED_OUTPUT_RETRIES = 2
+
+
+class DocumentMetadata(BaseModel):
+    title: str = Field(default="Not found", description="The document's main title")
+    authors: str = Field(default="Not found", description="All author names, comma-separated, in order")
+    institutions: str = Field(default="Not found", description="Affiliated universities, companies or organizations")
+    date: str = Field(default="Not found", description="Publication or creation date")
+    abstract: str = Field(default="Not found", description="The document's abstract or summary")
+    keywords: str = Field(default="Not found", description="Key topics or terms explicitly listed")
+    document_type: str = Field(default="Not found", description="paper, thesis, report, article, manual, book, etc.")
+
 FIELD_MAPPING = {
     "title:": "title",
     "author(s):": "authors",
@@ -49,46 +73,66 @@ FIELD_MAPPING = {
     "type:": "document_type"
 }
 
+_FIELD_LOOKUP = {prefix[:-1]: field for prefix, field in FIELD_MAPPING.items()}
+
+# Longer prefixes first so "author(s)" doesn't end up as "author"
+FIELD_RE = re.compile(
+    r'^\s*(' + '|'.join(
+        re.escape(p).replace(r'\ ', r'\s+') for p in sorted(_FIELD_LOOKUP, key=len, reverse=True)
+    ) + r')\s*:(.*)$',
+    re.IGNORECASE
+)
+
+
+_EMPTY_METADATA_TEMPLATE = {
+    "title": "Not found",
+    "authors": "Not found",
+    "institutions": "Not found",
+    "date": "Not found",
+    "abstract": "Not found",
+    "keywords": "Not found",
+    "document_type": "Not found",
+    "filename": ""
+}
+
 
 def _create_empty_metadata(filename: str) -> Dict[str, str]:
-    return {
-        "title": "Not found",
-        "authors": "Not found",
-        "institutions": "Not found",
-        "date": "Not found",
-        "abstract": "Not found",
-        "keywords": "Not found",
-        "document_type": "Not found",
-        "filename": filename
-    }
+    metadata = _EMPTY_METADATA_TEMPLATE.copy()
+    metadata["filename"] = filename
+    return metadata
 
 
 def _parse_metadata_response(response: str, filename: str) -> Dict[str, str]:
     metadata = _create_empty_metadata(filename)
-    lines = response.strip().split('\n')
+    lines = response.splitlines()
     current_field = None
     current_value: list[str] = []
 
     for line in lines:
-        line_lower = line.lower().strip()
+        match = FIELD_RE.match(line)
+        if match:
+            if current_field and current_value:
+                metadata[current_field] = ' '.join(current_value)
 
-        matched_field = None
-        for prefix, field_name in FIELD_MAPPING.items():
-            if line_lower.startswith(prefix):
-                if current_field and current_value:
-                    metadata[current_field] = ' '.join(current_value).strip()
+            current_field = _FIELD_LOOKUP[' '.join(match.group(1).lower().split())]
+            value_part = match.group(2).strip()
+            current_value = [value_part] if value_part else []
+        elif current_field and (stripped := line.strip()):
+            current_value.append(stripped)
 
-                current_field = field_name
-                value_part = line[len(prefix):].strip()
-                current_value = [value_part] if value_part else []
-                matched_field = field_name
-                break
+    if current_field and current_value:
+        metadata[current_field] = ' '.join(current_value)
 
-        if not matched_field and current_field and line.strip():
-            current_value.append(line.strip())
+    return metadata
 
-    if current_field and current_value:
-        metadata[current_field] = ' '.join(current_value).strip()
+
+def _metadata_from_structured(result: Any, filename: str) -> Dict[str, str]:
+    metadata = _create_empty_metadata(filename)
+    values = result.model_dump() if isinstance(result, BaseModel) else dict(result)
+
+    for field_name, value in values.items():
+        if field_name in metadata and isinstance(value, str) and value.strip():
+            metadata[field_name] = value.strip()
 
     return metadata
 
@@ -104,50 +148,118 @@ def _create_fallback_metadata(
             metadata["title"] = pdf_metadata["title"]
         if pdf_metadata.get("author"):
             metadata["authors"] = pdf_metadata["author"]
+        if year := _pdf_year(pdf_metadata):
+            metadata["date"] = year
 
     return metadata
 
 
-def create_metadata_chunk(metadata: Dict[str, str], document_name: str) -> str:
-    parts = [
-        "=== DOCUMENT METADATA ===",
-        f"Filename: {document_name}",
-    ]
+_PDF_YEAR_RE = re.compile(r'(?:19|20)\d{2}')
+
+
+def _pdf_year(pdf_metadata: Dict[str, Any]) -> Optional[str]:
+    # PDF dates have the form "D:YYYYMMDDHHmmSS..."
+    match = _PDF_YEAR_RE.search(str(pdf_metadata.get("creation_date") or ""))
+    return match.group(0) if match else None
+
+
+def _pdf_metadata_sufficient(pdf_metadata: Optional[Dict[str, Any]]) -> bool:
+    # Title and author are required; the year only counts towards the threshold
+    if settings.force_llm_metadata or not pdf_metadata:
+        return False
+    if not pdf_metadata.get("title") or not pdf_metadata.get("author"):
+        return False
+    completeness = 2 + bool(_pdf_year(pdf_metadata))
+    return completeness >= settings.metadata_llm_threshold
+
 
-    if metadata.get("title") and metadata["title"] != "Not found":
-        parts.append(f"Title: {metadata['title']}")
+# (field, label) in output order; block fields go on their own separated line
+_FIELD_SPEC = (
+    ("title", "Title"),
+    ("authors", "Author(s)"),
+    ("institutions", "Institution(s)"),
+    ("date", "Date/Year"),
+    ("document_type", "Document Type"),
+    ("keywords", "Keywords"),
+    ("abstract", "Abstract"),
+)
+_BLOCK_FIELDS = frozenset({"abstract"})
 
-    if metadata.get("authors") and metadata["authors"] != "Not found":
-        parts.append(f"Author(s): {metadata['authors']}")
-        parts.append(f"This document was written by: {metadata['authors']}")
-        parts.append(f"The author of this paper is: {metadata['authors']}")
+_METADATA_CHUNK_HEADER = "=== DOCUMENT METADATA ==="
+_METADATA_CHUNK_FOOTER = "=== END METADATA ==="
 
-    if metadata.get("institutions") and metadata["institutions"] != "Not found":
-        parts.append(f"Institution(s): {metadata['institutions']}")
-        parts.append(f"Affiliation: {metadata['institutions']}")
 
-    if metadata.get("date") and metadata["date"] != "Not found":
-        parts.append(f"Date/Year: {metadata['date']}")
-        parts.append(f"Published: {metadata['date']}")
+def create_metadata_chunk(metadata: Dict[str, str], document_name: str) -> str:
+    lines = [
+        f"\n{label}:\n{value}" if key in _BLOCK_FIELDS else f"{label}: {value}"
+        for key, label in _FIELD_SPEC
+        if (value := metadata.get(key)) and value != "Not found"
+    ]
+    return "\n".join((_METADATA_CHUNK_HEADER, f"Filename: {document_name}", *lines, _METADATA_CHUNK_FOOTER))
 
-    if metadata.get("document_type") and metadata["document_type"] != "Not found":
-        parts.append(f"Document Type: {metadata['document_type']}")
 
-    if metadata.get("keywords") and metadata["keywords"] != "Not found":
-        parts.append(f"Keywords: {metadata['keywords']}")
+class MetadataCache:
+    REQUIRED_KEYS = tuple(_EMPTY_METADATA_TEMPLATE)
 
-    if metadata.get("abstract") and metadata["abstract"] != "Not found":
-        parts.append(f"\nAbstract:\n{metadata['abstract']}")
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
 
-    parts.append("=== END METADATA ===")
+    @staticmethod
+    def make_key(first_pages_text: str, filename: str, pdf_context: str = "") -> str:
+        model_id = f"{settings.get_active_provider()}:{settings.get_llm_model('metadata')}"
+        digest = hashlib.sha256()
+        for part in (METADATA_PROMPT_VERSION, model_id, filename, pdf_context, first_pages_text):
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning(f"⚠️  [METADATA CACHE] Unreadable entry {key[:12]}, discarding: {exc}")
+            self._discard(path)
+            return None
+
+        if not isinstance(metadata, dict) or any(k not in metadata for k in self.REQUIRED_KEYS):
+            logger.info(f"🔄 [METADATA CACHE] Schema changed for {key[:12]}, re-extracting")
+            self._discard(path)
+            return None
+        return metadata
+
+    def put(self, key: str, metadata: Dict[str, str]) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(metadata, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning(f"⚠️  [METADATA CACHE] Failed to write {key[:12]}: {exc}")
 
-    return "\n".join(parts)
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 
 class MetadataExtractor:
-    def __init__(self, use_llm: bool = True):
+    def __init__(self, use_llm: bool = True, cache_dir: Optional[str] = None):
         self.use_llm = use_llm
-        self.llm = create_llm(temperature=0.0, max_tokens=1024) if use_llm else None
+        self.llm = create_llm(temperature=0.0, max_tokens=1024, purpose="metadata") if use_llm else None
+        self.cache = MetadataCache(cache_dir) if use_llm and cache_dir else None
+        self.structured_llm = self._create_structured_llm(self.llm) if use_llm else None
 
         if not use_llm:
             logger.info("⚡ MetadataExtractor: LLM extraction DISABLED (fast mode)")
@@ -164,24 +276,133 @@ class MetadataExtractor:
             logger.info(f"⚡ [METADATA] Fast extraction (PDF metadata only)")
             return _create_fallback_metadata(filename, pdf_metadata)
 
-        # Slow path: Use LLM for detailed extraction
-        logger.info(f"🔬 [METADATA] LLM-based extraction (may take ~30s on CPU)")
+        if _pdf_metadata_sufficient(pdf_metadata):
+            logger.info(f"⚡ [METADATA] PDF metadata complete enough, skipping LLM extraction")
+            return _create_fallback_metadata(filename, pdf_metadata)
+
+        first_pages_text = first_pages_text[:settings.metadata_extraction_char_limit]
         pdf_context = self._build_pdf_context(pdf_metadata)
+        cache_key, cached = self._lookup_cache(first_pages_text, filename, pdf_context)
+        if cached is not None:
+            logger.info(f"✅ [METADATA] Cache hit, skipping LLM extraction")
+            return cached
 
-        messages = [
-            SystemMessage(content=METADATA_EXTRACTION_PROMPT),
-            HumanMessage(
-                content=f"Filename: {filename}{pdf_context}\n\nDocument text (first pages):\n\n{first_pages_text}"
-            )
-        ]
+        # Slow path: Use LLM for detailed extraction
+        logger.info(f"🔬 [METADATA] LLM-based extraction (may take ~30s on CPU)")
+        messages = self._build_messages(first_pages_text, filename, pdf_context)
 
         try:
-            response = self.llm.invoke(messages)
-            return _parse_metadata_response(response.content, filename)
+            metadata = self._invoke_llm(messages, filename)
+            if cache_key:
+                self.cache.put(cache_key, metadata)
+            return metadata
         except Exception as exc:
             logger.error(f"Failed to extract metadata via LLM: {exc}")
             return _create_fallback_metadata(filename, pdf_metadata)
 
+    def extract_metadata_batch(
+            self,
+            items: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, str]]:
+        if not self.use_llm:
+            return [_create_fallback_metadata(filename, pdf_metadata) for _, filename, pdf_metadata in items]
+
+        results: List[Optional[Dict[str, str]]] = [None] * len(items)
+        pending = []
+
+        for i, (first_pages_text, filename, pdf_metadata) in enumerate(items):
+            if _pdf_metadata_sufficient(pdf_metadata):
+                logger.info(f"⚡ [METADATA] {filename}: PDF metadata complete enough, skipping LLM")
+                results[i] = _create_fallback_metadata(filename, pdf_metadata)
+                continue
+
+            first_pages_text = first_pages_text[:settings.metadata_extraction_char_limit]
+            pdf_context = self._build_pdf_context(pdf_metadata)
+            cache_key, cached = self._lookup_cache(first_pages_text, filename, pdf_context)
+            if cached is not None:
+                results[i] = cached
+                continue
+
+            pending.append((i, cache_key, self._build_messages(first_pages_text, filename, pdf_context)))
+
+        if pending:
+            logger.info(f"🔬 [METADATA] Batched LLM extraction for {len(pending)} documents")
+            batch_llm = self.structured_llm or self.llm
+            responses = batch_llm.batch(
+                [messages for _, _, messages in pending],
+                config={"max_concurrency": len(pending)},
+                return_exceptions=True
+            )
+
+            for (i, cache_key, messages), response in zip(pending, responses):
+                _, filename, pdf_metadata = items[i]
+                try:
+                    if isinstance(response, Exception):
+                        # Single call with retry and text fallback
+                        metadata = self._invoke_llm(messages, filename)
+                    elif self.structured_llm is not None:
+                        metadata = _metadata_from_structured(response, filename)
+                    else:
+                        metadata = _parse_metadata_response(response.content, filename)
+                except Exception as exc:
+                    logger.error(f"Failed to extract metadata via LLM for {filename}: {exc}")
+                    results[i] = _create_fallback_metadata(filename, pdf_metadata)
+                    continue
+
+                if cache_key:
+                    self.cache.put(cache_key, metadata)
+                results[i] = metadata
+
+        return results
+
+    @staticmethod
+    def _create_structured_llm(llm):
+        try:
+            return llm.with_structured_output(DocumentMetadata)
+        except (NotImplementedError, AttributeError) as exc:
+            logger.info(f"ℹ️  [METADATA] Structured output unavailable, parsing text responses: {exc}")
+            return None
+
+    def _invoke_llm(self, messages: list, filename: str) -> Dict[str, str]:
+        if self.structured_llm is not None:
+            for attempt in range(STRUCTURED_OUTPUT_RETRIES + 1):
+                try:
+                    return _metadata_from_structured(self.structured_llm.invoke(messages), filename)
+                except (ValidationError, OutputParserException) as exc:
+                    logger.warning(f"⚠️  [METADATA] Invalid structured output (attempt {attempt + 1}): {exc}")
+                    messages = messages + [HumanMessage(
+                        content=f"Your previous answer did not match the required schema: {exc}\n"
+                                f"Answer again with every field filled, using \"Not found\" where needed."
+                    )]
+            logger.warning(f"⚠️  [METADATA] Falling back to text parsing for {filename}")
+
+        response = self.llm.invoke(messages)
+        return _parse_metadata_response(response.content, filename)
+
+    def _lookup_cache(
+            self,
+            first_pages_text: str,
+            filename: str,
+            pdf_context: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+        if not self.cache:
+            return None, None
+
+        cache_key = MetadataCache.make_key(first_pages_text, filename, pdf_context)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached["filename"] = filename
+        return cache_key, cached
+
+    @staticmethod
+    def _build_messages(first_pages_text: str, filename: str, pdf_context: str) -> list:
+        return [
+            _SYSTEM_MSG,
+            HumanMessage(
+                content=f"Filename: {filename}{pdf_context}\n\nDocument text (first pages):\n\n{first_pages_text}"
+            )
+        ]
+
     @staticmethod
     def _build_pdf_context(pdf_metadata: Optional[Dict[str, Any]]) -> str:
         if not pdf_metadata:
@@ -1,8 +1,8 @@
 import logging
+import re
 import time
 import os
-from typing import Optional, TYPE_CHECKING
-from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from sqlalchemy.orm import Session
 
@@ -12,12 +12,16 @@ from .file_handler import FileHandler
 from .metadata import MetadataExtractor, create_metadata_chunk
 from .processor import process_document as create_chunks
 from core.settings import settings
+from core.state import processing_status
 
 if TYPE_CHECKING:
     from core.vector_store import VectorStoreService
 
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r'\S+')
+_PROGRESS_MIN_STEP = 0.02
+
 
 class DocumentPipelineService:
 
@@ -28,29 +32,35 @@ class DocumentPipelineService:
     ):
         self.vector_store = vector_store
         self.metadata_extractor = metadata_extractor
+        self._pickle_dir = settings.pickle_dir
+        self._parent_chunk_size = settings.parent_chunk_size
+        self._child_chunk_size = settings.child_chunk_size or settings.chunk_size
 
     def _report_progress(self, doc_id: int, stage: str, progress: float, message: str):
-        try:
-            import sys
-            if 'main' in sys.modules:
-                from main import processing_status
-                processing_status[doc_id] = {
-                    "doc_id": doc_id,
-                    "stage": stage,
-                    "progress": progress,
-                    "message": message,
-                    "timestamp": datetime.now().isoformat()
-                }
-            logger.info(f"📊 Progress: [{int(progress*100)}%] {stage} - {message}")
-        except Exception as e:
-            logger.debug(f"Progress reporting skipped: {e}")
-            logger.info(f"📊 Progress: [{int(progress*100)}%] {stage} - {message}")
+        previous = processing_status.get(doc_id)
+        if (
+            previous is None
+            or previous["stage"] != stage
+            or progress - previous["progress"] >= _PROGRESS_MIN_STEP
+        ):
+            # Timestamp as float; ISO formatting happens in the SSE handler
+            processing_status[doc_id] = {
+                "doc_id": doc_id,
+                "stage": stage,
+                "progress": progress,
+                "message": message,
+                "timestamp": time.time()
+            }
+        logger.info(f"📊 Progress: [{int(progress*100)}%] {stage} - {message}")
 
     def process_document(
         self,
         document: Document,
         file_path: str,
-        db: Session
+        db: Session,
+        metadata_chunk: Optional[str] = None,
+        text: Optional[str] = None,
+        on_text_extracted: Optional[Callable[[], None]] = None
     ) -> Document:
         pipeline_start = time.time()
         doc_id = document.id
@@ -70,19 +80,28 @@ class DocumentPipelineService:
             self._report_progress(doc_id, "extraction", 0.1, "Extracting text from document...")
             text_start = time.time()
 
-            text = FileHandler.extract_text(file_path)
+            if text is None:
+                text = FileHandler.extract_text(file_path)
+            else:
+                logger.info(f"   → Using text prefetched while the previous document was processed")
+
+            if on_text_extracted is not None:
+                on_text_extracted()
 
             text_elapsed = time.time() - text_start
             logger.info(f"✅ [STEP 1/5] Text extracted in {text_elapsed:.1f}s")
             logger.info(f"   → Characters: {len(text):,}")
-            logger.info(f"   → Words: ~{len(text.split()):,}")
-            logger.info(f"   → Lines: ~{text.count(chr(10)):,}")
+            if logger.isEnabledFor(logging.DEBUG):
+                # Word and line counts are full passes over the text, so only in debug mode
+                logger.debug(f"   → Words: ~{sum(1 for _ in _WORD_RE.finditer(text)):,}")
+                logger.debug(f"   → Lines: ~{text.count(chr(10)):,}")
             self._report_progress(doc_id, "extraction", 0.2, f"Text extracted ({len(text):,} chars)")
             logger.info(f"📋 [STEP 2/5] Metadata Extraction")
             self._report_progress(doc_id, "metadata", 0.25, "Extracting metadata...")
             metadata_start = time.time()
 
-            metadata_chunk = self._extract_metadata(file_path, doc_filename)
+            if metadata_chunk is None:
+                metadata_chunk = self._extract_metadata(file_path, doc_filename)
 
             metadata_elapsed = time.time() - metadata_start
             if metadata_chunk:
@@ -95,15 +114,15 @@ class DocumentPipelineService:
             self._report_progress(doc_id, "chunking", 0.35, "Splitting document into chunks...")
             chunk_start = time.time()
 
-            pickle_path = os.path.join(settings.pickle_dir, f"doc_{doc_id}.pkl")
+            pickle_path = os.path.join(self._pickle_dir, f"doc_{doc_id}.pkl")
             collection_name = document.collection_name
 
             if not collection_name:
                 raise ValueError(f"Invalid collection_name for document {doc_id}")
 
             logger.info(f"   → Chunking with parent-child strategy...")
-            logger.info(f"   → Parent size: {settings.parent_chunk_size} tokens")
-            logger.info(f"   → Child size: {settings.child_chunk_size or settings.chunk_size} tokens")
+            logger.info(f"   → Parent size: {self._parent_chunk_size} tokens")
+            logger.info(f"   → Child size: {self._child_chunk_size} tokens")
 
             chunks = create_chunks(
                 doc_id,
@@ -125,24 +144,20 @@ class DocumentPipelineService:
 
             logger.info(f"   → Resetting collection '{collection_name}'...")
             self.vector_store.reset_collection(collection_name)
-            self._report_progress(doc_id, "embedding", 0.55, "Embedding chunks...")
-            total_chunks = len(chunks)
-            for idx, chunk in enumerate(chunks, 1):
-                progress = 0.55 + (0.30 * (idx / total_chunks))
-                if idx % 10 == 0 or idx == total_chunks:  # Report every 10 chunks or at end
-                    self._report_progress(
-                        doc_id,
-                        "embedding",
-                        progress,
-                        f"Embedding chunk {idx}/{total_chunks}"
-                    )
+            self._report_progress(doc_id, "embedding", 0.55, f"Embedding {len(chunks)} chunks...")
 
             logger.info(f"   → Generating embeddings for {len(chunks)} chunks...")
             self.vector_store.add_documents(
                 doc_id,
                 chunks,
                 collection_name,
-                document_name=doc_filename
+                document_name=doc_filename,
+                progress_callback=lambda done, total: self._report_progress(
+                    doc_id,
+                    "embedding",
+                    0.55 + 0.30 * done / total,
+                    f"Stored {done}/{total} chunks"
+                )
             )
 
             vector_elapsed = time.time() - vector_start
@@ -163,6 +178,7 @@ class DocumentPipelineService:
 
             document.pickle_path = pickle_path
             document.processed = True
+            document.processing_started_at = None
             document.num_chunks = len(chunks)
             db.commit()
 
@@ -205,14 +221,45 @@ class DocumentPipelineService:
             db.rollback()
             raise
 
+    def extract_metadata_batch(self, documents: List[Tuple[int, str, str]]) -> Dict[int, str]:
+        readable = []
+        inputs = []
+        for doc_id, file_path, filename in documents:
+            try:
+                first_pages_text, pdf_metadata = self._read_metadata_inputs(file_path, filename)
+            except Exception as exc:
+                logger.warning(f"⚠️  Could not read metadata inputs for Doc ID {doc_id}: {exc}")
+                continue
+            readable.append((doc_id, filename))
+            inputs.append((first_pages_text, filename, pdf_metadata))
+
+        if not inputs:
+            return {}
+
+        extracted = self.metadata_extractor.extract_metadata_batch(inputs)
+        return {
+            doc_id: create_metadata_chunk(metadata, filename)
+            for (doc_id, filename), metadata in zip(readable, extracted)
+        }
+
+    @staticmethod
+    def _read_metadata_inputs(file_path: str, filename: str) -> Tuple[str, Optional[dict]]:
+        logger.info(f"   → Reading first 2 pages for metadata...")
+        first_pages_text = FileHandler.extract_first_pages_text(
+            file_path,
+            num_pages=2,
+            max_chars=settings.metadata_extraction_char_limit
+        )
+
+        pdf_metadata = None
+        if filename.lower().endswith('.pdf'):
+            pdf_metadata = FileHandler.extract_pdf_metadata(file_path)
+
+        return first_pages_text, pdf_metadata
+
     def _extract_metadata(self, file_path: str, filename: str) -> Optional[str]:
         try:
-            logger.info(f"   → Reading first 2 pages for metadata...")
-            first_pages_text = FileHandler.extract_first_pages_text(file_path, num_pages=2)
-
-            pdf_metadata = None
-            if filename.lower().endswith('.pdf'):
-                pdf_metadata = FileHandler.extract_pdf_metadata(file_path)
+            first_pages_text, pdf_metadata = self._read_metadata_inputs(file_path, filename)
 
             extracted_metadata = self.metadata_extractor.extract_metadata_from_text(
                 first_pages_text,
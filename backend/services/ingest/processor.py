@@ -1,7 +1,9 @@
 import logging
 import os
 import pickle
-from typing import List, Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 
 from docling_core.transforms.chunker.hierarchical_chunker import ChunkingDocSerializer, ChunkingSerializerProvider
 from docling_core.transforms.chunker.hybrid_chunker import HybridChunker
@@ -21,24 +23,69 @@ class MarkdownTableSerializerProvider(ChunkingSerializerProvider):
         )
 
 
-def load_parent_document(pickle_path: Optional[str], parent_id: int) -> str:
-    if not pickle_path:
-        return ""
+# Hot parent texts across retrieval rounds and chat turns; "" marks empty/missing IDs
+_PARENT_CACHE: "OrderedDict[Tuple[str, int], str]" = OrderedDict()
+_parent_cache_lock = threading.Lock()
+
+
+def _cache_parents(pickle_path: str, parents: Dict[int, str]) -> None:
+    with _parent_cache_lock:
+        for parent_id, text in parents.items():
+            _PARENT_CACHE[(pickle_path, parent_id)] = text
+            _PARENT_CACHE.move_to_end((pickle_path, parent_id))
+        while len(_PARENT_CACHE) > settings.parent_doc_cache_size:
+            _PARENT_CACHE.popitem(last=False)
+
 
-    try:
-        with open(pickle_path, 'rb') as f:
-            parent_docs = pickle.load(f)
+def clear_parent_cache(pickle_path: Optional[str] = None) -> None:
+    with _parent_cache_lock:
+        if pickle_path is None:
+            _PARENT_CACHE.clear()
+            return
+        for key in [k for k in _PARENT_CACHE if k[0] == pickle_path]:
+            del _PARENT_CACHE[key]
 
-        if parent_id < len(parent_docs):
-            return parent_docs[parent_id]
-        return ""
 
-    except FileNotFoundError:
-        logger.error(f"Parent document file not found: {pickle_path}")
-        return ""
-    except Exception as exc:
-        logger.error(f"Error loading parent document from {pickle_path}: {exc}")
-        return ""
+def load_parent_document(pickle_path: Optional[str], parent_id: int) -> str:
+    return load_parent_documents_bulk(pickle_path, [parent_id]).get(parent_id, "")
+
+
+def load_parent_documents_bulk(pickle_path: Optional[str], parent_ids: Iterable[int]) -> Dict[int, str]:
+    if not pickle_path:
+        return {}
+
+    result: Dict[int, str] = {}
+    missing: List[int] = []
+    with _parent_cache_lock:
+        for parent_id in parent_ids:
+            key = (pickle_path, parent_id)
+            if key in _PARENT_CACHE:
+                _PARENT_CACHE.move_to_end(key)
+                result[parent_id] = _PARENT_CACHE[key]
+            else:
+                missing.append(parent_id)
+
+    if missing:
+        parent_docs = None
+        try:
+            with open(pickle_path, 'rb') as f:
+                parent_docs = pickle.load(f)
+        except FileNotFoundError:
+            logger.error(f"Parent document file not found: {pickle_path}")
+        except Exception as exc:
+            logger.error(f"Error loading parent documents from {pickle_path}: {exc}")
+
+        # On a read failure, still return the parents served from the cache
+        if parent_docs is not None:
+            total = len(parent_docs)
+            loaded = {
+                parent_id: (parent_docs[parent_id] or "") if 0 <= parent_id < total else ""
+                for parent_id in missing
+            }
+            _cache_parents(pickle_path, loaded)
+            result.update(loaded)
+
+    return {parent_id: text for parent_id, text in result.items() if text}
 
 
 def process_document(
@@ -74,6 +121,7 @@ def process_document(
     os.makedirs(os.path.dirname(pickle_path), exist_ok=True)
     with open(pickle_path, 'wb') as f:
         pickle.dump(parent_docs_with_meta, f)
+    clear_parent_cache(pickle_path)
     logger.info(f"   → Saved parent documents to: {pickle_path}")
 
     chunks = []
@@ -1,13 +1,16 @@
 import asyncio
 import logging
 import os
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
 
 from persistence.models import Document
 from persistence.session import SessionLocal
+from .file_handler import FileHandler
 from .pipeline import DocumentPipelineService
 from core.embeddings import EmbeddingService
 from .metadata import MetadataExtractor
+from core import state
 from core.settings import settings
 from core.vector_store import VectorStoreService
 from services.integrations.zotero.client import ZoteroService
@@ -18,7 +21,10 @@ logger = logging.getLogger(__name__)
 class DocumentProcessingWorker:
     def __init__(self):
         self.zotero = ZoteroService.get_instance()
-        self.metadata_extractor = MetadataExtractor(use_llm=settings.use_llm_metadata_extraction)
+        self.metadata_extractor = MetadataExtractor(
+            use_llm=settings.use_llm_metadata_extraction,
+            cache_dir=settings.metadata_cache_dir
+        )
         self.embedding_service = EmbeddingService.get_instance()
         self.vector_store = VectorStoreService(self.embedding_service)
         self.pipeline = DocumentPipelineService(
@@ -26,11 +32,16 @@ class DocumentProcessingWorker:
             self.metadata_extractor
         )
 
+        # Extracts the next document's text while the current one is being embedded
+        self._extract_executor: Optional[ThreadPoolExecutor] = None
+
         self.running = False
         self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.check_interval = 10
 
         self._check_event: Optional[asyncio.Event] = None
+        self._claimed_ids: Set[int] = set()
 
     async def start(self):
         if self.running:
@@ -38,6 +49,9 @@ class DocumentProcessingWorker:
             return
 
         self.running = True
+        # Dedicated thread so long ingest runs don't block the default executor used by requests
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-worker")
+        self._extract_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="doc-extract")
         self._check_event = asyncio.Event()
         self._task = asyncio.create_task(self._processing_loop())
         logger.info(f"Document processing worker started (interval: {self.check_interval}s)")
@@ -51,6 +65,14 @@ class DocumentProcessingWorker:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._extract_executor:
+            self._extract_executor.shutdown(wait=False, cancel_futures=True)
+            self._extract_executor = None
+        if self._claimed_ids:
+            self._release_claims(self._claimed_ids)
         logger.info("Document processing worker stopped")
 
     def trigger_check(self):
@@ -110,12 +132,105 @@ class DocumentProcessingWorker:
                 pass
 
     async def _process_pending_documents(self):
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self.process_documents)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.process_documents)
+
+    def _prefetch_metadata(self, docs) -> Dict[int, str]:
+        if not self.metadata_extractor.use_llm or len(docs) < 2:
+            return {}
+
+        candidates = [
+            (doc.id, doc.file_path, doc.filename)
+            for doc in docs
+            if doc.file_path and os.path.exists(doc.file_path)
+        ]
+        if len(candidates) < 2:
+            return {}
+
+        try:
+            return self.pipeline.extract_metadata_batch(candidates)
+        except Exception as exc:
+            logger.warning(f"⚠️  [WORKER] Batched metadata extraction failed, falling back per document: {exc}")
+            return {}
+
+    def _prefetch_text(self, doc: Document, prefetched_text: Dict[int, Future]) -> None:
+        file_path = doc.file_path
+        executor = self._extract_executor
+        if executor is None or doc.processed or not file_path or not os.path.exists(file_path):
+            return
+        prefetched_text[doc.id] = executor.submit(FileHandler.extract_text, file_path)
+
+    @staticmethod
+    def _take_prefetched_text(doc_id: int, prefetched_text: Dict[int, Future]) -> Optional[str]:
+        future = prefetched_text.pop(doc_id, None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as exc:
+            # The pipeline extracts again and reports the error there
+            logger.warning(f"⚠️  [WORKER] Prefetched extraction for Doc ID {doc_id} failed: {exc}")
+            return None
+
+    def _release_claims(self, doc_ids: Iterable[int]) -> None:
+        """Clear this worker's claims on documents it has not finished.
+
+        Claims of other workers are left alone; stale ones are taken over
+        after ``ingest_claim_timeout``.
+        """
+        db = SessionLocal()
+        try:
+            released = db.query(Document).filter(
+                Document.id.in_(list(doc_ids)),
+                Document.processed == False,
+                Document.processing_started_at.isnot(None)
+            ).update({Document.processing_started_at: None}, synchronize_session=False)
+            db.commit()
+            self._claimed_ids.clear()
+            if released:
+                logger.info(f"🔓 [WORKER] Released {released} document claim(s)")
+        except Exception as exc:
+            logger.error(f"❌ [WORKER] Failed to release claims: {exc}")
+            db.rollback()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _renew_claim(doc: Document, db) -> None:
+        # The batch is claimed at once but processed one by one; without a fresh stamp,
+        # later documents could pass ingest_claim_timeout before they even start
+        from sqlalchemy import func
+
+        doc.processing_started_at = func.now()
+        db.commit()
+
+    @staticmethod
+    def _claim_pending_documents(db) -> List[Document]:
+        """Claim the next batch so parallel workers never pick the same document.
+
+        Rows locked by another worker are skipped; claims older than
+        ``ingest_claim_timeout`` belong to a crashed worker and are taken over.
+        """
+        from datetime import timedelta
+        from sqlalchemy import func, or_
+
+        stale_before = func.now() - timedelta(seconds=settings.ingest_claim_timeout)
+        pending_docs = db.query(Document).filter(
+            Document.processed == False,
+            or_(Document.num_chunks.is_(None), Document.num_chunks >= 0),
+            or_(Document.processing_started_at.is_(None), Document.processing_started_at < stale_before)
+        ).order_by(Document.id).limit(settings.metadata_batch_size).with_for_update(skip_locked=True).all()
+
+        for doc in pending_docs:
+            if doc.processing_started_at is not None:
+                logger.warning(f"♻️  [WORKER] Re-queuing Doc ID {doc.id}: claim from {doc.processing_started_at} expired")
+            doc.processing_started_at = func.now()
+        # Commit releases the row locks; processing happens outside the transaction
+        db.commit()
+        return pending_docs
 
     def process_documents(self):
         import time
-        from sqlalchemy import or_
         db = SessionLocal()
 
         processed_count = 0
@@ -123,14 +238,12 @@ class DocumentProcessingWorker:
 
         try:
             while True:
-                logger.debug("📊 [WORKER] Querying database for next pending document...")
+                logger.debug("📊 [WORKER] Querying database for next pending documents...")
 
-                pending_doc = db.query(Document).filter(
-                    Document.processed == False,
-                    or_(Document.num_chunks is None, Document.num_chunks >= 0)
-                ).first()
+                pending_docs = self._claim_pending_documents(db)
+                self._claimed_ids = {doc.id for doc in pending_docs}
 
-                if not pending_doc:
+                if not pending_docs:
                     if processed_count > 0:
                         batch_elapsed = time.time() - batch_start_time
                         logger.info("=" * 80)
@@ -147,115 +260,111 @@ class DocumentProcessingWorker:
                         logger.debug(f"   Already processed: {processed_docs}")
                         logger.debug(f"   Pending (processed=False): {total_docs - processed_docs}")
                     break
-                doc = pending_doc
-                current_doc_id = doc.id
-                current_doc_filename = doc.filename
-
-                try:
-                    doc_start_time = time.time()
-                    processed_count += 1
-                    db.refresh(doc)
-                    if doc.processed:
-                        logger.info(f"⏭️  [WORKER] Skipping Doc ID {doc.id}: Already processed")
-                        continue
-                    if doc.file_path:
-                        if "zotero" in doc.file_path.lower():
-                            source = "🔗 Zotero"
-                        elif "uploads" in doc.file_path.lower():
-                            source = "📤 Upload"
-                        else:
-                            source = "❓ Unknown"
-                    else:
-                        source = "⚠️ No file"
-
-                    logger.info("")
-                    logger.info("=" * 80)
-                    logger.info(f"🔨 [WORKER] PROCESSING DOCUMENT")
-                    logger.info(f"   → Doc ID: {doc.id}")
-                    logger.info(f"   → Filename: {doc.filename}")
-                    logger.info(f"   → Source: {source}")
-                    logger.info(f"   → Collection: {doc.collection_name}")
-                    logger.info("=" * 80)
-
-                    if doc.file_path and os.path.exists(doc.file_path):
-                        file_size = os.path.getsize(doc.file_path)
-                        logger.info(f"📄 [WORKER] File found:")
-                        logger.info(f"   → Path: {doc.file_path}")
-                        logger.info(f"   → Size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
-                        try:
-                            import sys
-                            if 'main' in sys.modules:
-                                from main import currently_processing_doc_id as _
-                                import main
-                                main.currently_processing_doc_id = doc.id
-                                logger.debug(f"🎯 Set document {doc.id} as actively processing")
-                        except Exception as e:
-                            logger.debug(f"Could not set currently_processing_doc_id: {e}")
-
-                        logger.info(f"🚀 [WORKER] Starting pipeline for Doc ID {doc.id}...")
-                        self.pipeline.process_document(doc, doc.file_path, db)
 
-                        try:
-                            import sys
-                            if 'main' in sys.modules:
-                                import main
-                                main.currently_processing_doc_id = None
-                                logger.debug(f"✅ Cleared actively processing marker")
-                        except Exception as e:
-                            logger.debug(f"Could not clear currently_processing_doc_id: {e}")
+                prefetched_metadata = self._prefetch_metadata(pending_docs)
+                prefetched_text: Dict[int, Future] = {}
 
-                        db.commit()
+                for position, doc in enumerate(pending_docs):
+                    current_doc_id = doc.id
+                    current_doc_filename = doc.filename
 
+                    try:
+                        doc_start_time = time.time()
+                        processed_count += 1
                         db.refresh(doc)
+                        if doc.processed:
+                            logger.info(f"⏭️  [WORKER] Skipping Doc ID {doc.id}: Already processed")
+                            continue
+                        self._renew_claim(doc, db)
+                        if doc.file_path:
+                            if "zotero" in doc.file_path.lower():
+                                source = "🔗 Zotero"
+                            elif "uploads" in doc.file_path.lower():
+                                source = "📤 Upload"
+                            else:
+                                source = "❓ Unknown"
+                        else:
+                            source = "⚠️ No file"
 
-                        doc_elapsed = time.time() - doc_start_time
                         logger.info("")
                         logger.info("=" * 80)
-                        logger.info(f"✅ [WORKER] DOCUMENT {doc.id} COMPLETE")
+                        logger.info(f"🔨 [WORKER] PROCESSING DOCUMENT")
+                        logger.info(f"   → Doc ID: {doc.id}")
                         logger.info(f"   → Filename: {doc.filename}")
-                        logger.info(f"   → Chunks: {doc.num_chunks}")
-                        logger.info(f"   → Processing time: {doc_elapsed:.1f}s")
+                        logger.info(f"   → Source: {source}")
+                        logger.info(f"   → Collection: {doc.collection_name}")
                         logger.info("=" * 80)
-                        logger.info("")
 
-                        logger.info("🔄 [WORKER] Checking for next pending document...")
-                        continue
+                        if doc.file_path and os.path.exists(doc.file_path):
+                            file_size = os.path.getsize(doc.file_path)
+                            logger.info(f"📄 [WORKER] File found:")
+                            logger.info(f"   → Path: {doc.file_path}")
+                            logger.info(f"   → Size: {file_size:,} bytes ({file_size/1024:.1f} KB)")
+                            state.currently_processing_doc_id = doc.id
+                            logger.debug(f"🎯 Set document {doc.id} as actively processing")
+
+                            # Start the next extraction only once this document has its text,
+                            # so two Docling conversions never run at the same time
+                            next_doc = pending_docs[position + 1] if position + 1 < len(pending_docs) else None
+
+                            logger.info(f"🚀 [WORKER] Starting pipeline for Doc ID {doc.id}...")
+                            self.pipeline.process_document(
+                                doc,
+                                doc.file_path,
+                                db,
+                                metadata_chunk=prefetched_metadata.get(doc.id),
+                                text=self._take_prefetched_text(doc.id, prefetched_text),
+                                on_text_extracted=(
+                                    (lambda: self._prefetch_text(next_doc, prefetched_text))
+                                    if next_doc is not None else None
+                                )
+                            )
+
+                            state.currently_processing_doc_id = None
+                            logger.debug(f"✅ Cleared actively processing marker")
+
+                            doc_elapsed = time.time() - doc_start_time
+                            logger.info("")
+                            logger.info("=" * 80)
+                            logger.info(f"✅ [WORKER] DOCUMENT {doc.id} COMPLETE")
+                            logger.info(f"   → Filename: {doc.filename}")
+                            logger.info(f"   → Chunks: {doc.num_chunks}")
+                            logger.info(f"   → Processing time: {doc_elapsed:.1f}s")
+                            logger.info("=" * 80)
+                            logger.info("")
+
+                            continue
 
-                    else:
-                        logger.warning(
-                            f"⚠️  [WORKER] Cannot process Doc ID {doc.id} ({doc.filename}): "
-                            f"File not found at {doc.file_path}"
-                        )
-                        doc.processed = True
-                        doc.num_chunks = -1
-                        db.commit()
-                        logger.info(f"📝 Marked Doc ID {doc.id} as failed (file not found)")
-                        continue
+                        else:
+                            logger.warning(
+                                f"⚠️  [WORKER] Cannot process Doc ID {doc.id} ({doc.filename}): "
+                                f"File not found at {doc.file_path}"
+                            )
+                            doc.processed = True
+                            doc.num_chunks = -1
+                            doc.processing_started_at = None
+                            db.commit()
+                            logger.info(f"📝 Marked Doc ID {doc.id} as failed (file not found)")
+                            continue
 
-                except Exception as exc:
-                    try:
-                        import sys
-                        if 'main' in sys.modules:
-                            import main
-                            main.currently_processing_doc_id = None
-                    except Exception as e:
-                        logger.error(str(e))
-                        pass
+                    except Exception as exc:
+                        state.currently_processing_doc_id = None
 
-                    logger.error(f"❌ Failed to process Doc ID {current_doc_id} ({current_doc_filename}): {exc}", exc_info=True)
+                        logger.error(f"❌ Failed to process Doc ID {current_doc_id} ({current_doc_filename}): {exc}", exc_info=True)
 
-                    try:
-                        failed_doc = db.query(Document).filter(Document.id == current_doc_id).first()
-                        if failed_doc:
-                            failed_doc.processed = True
-                            failed_doc.num_chunks = -1
-                            db.commit()
-                            logger.warning(f"⚠️  Marked Doc ID {current_doc_id} as failed to prevent retry loop")
-                    except Exception as mark_exc:
-                        logger.error(f"Failed to mark document as failed: {mark_exc}")
-                        db.rollback()
+                        try:
+                            failed_doc = db.query(Document).filter(Document.id == current_doc_id).first()
+                            if failed_doc:
+                                failed_doc.processed = True
+                                failed_doc.num_chunks = -1
+                                failed_doc.processing_started_at = None
+                                db.commit()
+                                logger.warning(f"⚠️  Marked Doc ID {current_doc_id} as failed to prevent retry loop")
+                        except Exception as mark_exc:
+                            logger.error(f"Failed to mark document as failed: {mark_exc}")
+                            db.rollback()
 
-                    continue
+                        continue
 
         except Exception as exc:
             logger.error(f"❌ Critical error in process_documents: {exc}", exc_info=True)
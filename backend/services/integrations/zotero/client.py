@@ -1,6 +1,7 @@
 import logging
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from typing import Iterator, List, Dict, Any, Optional
 from pyzotero import zotero
 
 from core.settings import settings
@@ -18,11 +19,14 @@ logger.info("=" * 80)
 
 class ZoteroService:
     _instance = None
+    _init_lock = threading.Lock()
 
     @classmethod
     def get_instance(cls) -> "ZoteroService":
         if cls._instance is None:
-            cls._instance = cls()
+            with cls._init_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
 
     def __init__(self):
@@ -36,22 +40,64 @@ class ZoteroService:
             settings.zotero_library_type,
             settings.zotero_api_key
         )
+        self._last_version: Optional[int] = None
+        self._cached_items: List[Dict[str, Any]] = []
+        self._thread_clients = threading.local()
         logger.info(f"Zotero service initialized (library: {settings.zotero_library_id})")
 
     def is_enabled(self) -> bool:
         return self.client is not None
 
+    def _thread_client(self) -> zotero.Zotero:
+        # pyzotero keeps per-request state (request, url_params, links) on the instance,
+        # so concurrent downloads each need their own client
+        client = getattr(self._thread_clients, "client", None)
+        if client is None:
+            client = zotero.Zotero(
+                settings.zotero_library_id,
+                settings.zotero_library_type,
+                settings.zotero_api_key
+            )
+            self._thread_clients.client = client
+        return client
+
     def get_all_documents(self) -> List[Dict[str, Any]]:
         if not self.client:
             return []
 
         try:
+            # The library version changes on every modification; limit=1 keeps the probe to one item
+            version = self.client.last_modified_version(limit=1)
+            if version is not None and version == self._last_version:
+                logger.debug(f"Zotero library unchanged (version {version}), using cached items")
+                return self._cached_items
+
             items = self.client.everything(self.client.top())
+            self._cached_items = items
+            self._last_version = version
             return items
         except Exception as exc:
             logger.error(f"Failed to retrieve documents from Zotero: {exc}")
             return []
 
+    def iter_documents(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield top-level items page by page instead of loading the whole library."""
+        if not self.client:
+            return
+
+        start = 0
+        while True:
+            try:
+                page = self.client.top(limit=page_size, start=start)
+            except Exception as exc:
+                logger.error(f"Failed to retrieve documents from Zotero (offset {start}): {exc}")
+                return
+
+            yield from page
+            if len(page) < page_size:
+                return
+            start += page_size
+
     def get_document_by_key(self, item_key: str) -> Optional[Dict[str, Any]]:
         if not self.client:
             return None
@@ -87,8 +133,9 @@ class ZoteroService:
         if not self.client:
             return None
 
+        client = self._thread_client()
         try:
-            item = self.client.item(item_key)
+            item = client.item(item_key)
             if not item:
                 logger.error(f"Item {item_key} not found")
                 return None
@@ -99,7 +146,7 @@ class ZoteroService:
             if not filename.lower().endswith('.pdf'):
                 filename += '.pdf'
 
-            file_content = self.client.file(item_key)
+            file_content = client.file(item_key)
 
             os.makedirs(output_dir, exist_ok=True)
             file_path = os.path.join(output_dir, filename)
@@ -160,7 +207,7 @@ class ZoteroService:
             return []
 
         try:
-            items = self.client.everything(self.client.top())
+            items = self.get_all_documents()
             results = []
 
             for item in items:
@@ -1,8 +1,9 @@
 import asyncio
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
-from persistence.models import Document
 from persistence.session import SessionLocal
 from .client import ZoteroService
 
@@ -14,6 +15,7 @@ class ZoteroPoller:
         self.zotero = ZoteroService.get_instance()
         self.running = False
         self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.poll_interval = 60
         self.auto_sync = auto_sync
 
@@ -28,6 +30,8 @@ class ZoteroPoller:
             return
 
         self.running = True
+        # Dedicated thread so Zotero requests don't occupy the app's default executor
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="zotero-poll")
         self._task = asyncio.create_task(self._poll_loop())
         logger.info(f"Zotero poller started (interval: {self.poll_interval}s)")
 
@@ -39,6 +43,9 @@ class ZoteroPoller:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         logger.info("Zotero poller stopped")
 
     async def _poll_loop(self):
@@ -54,79 +61,84 @@ class ZoteroPoller:
         if not self.zotero.is_enabled():
             return
 
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._sync_check_documents)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._sync_check_documents)
 
     def _sync_check_documents(self):
-        db = SessionLocal()
         try:
-            existing_filenames = {
-                doc.filename for doc in db.query(Document).all()
-            }
-
-            zotero_items = self.zotero.get_all_documents()
+            new_items = self._find_new_items()
+        except Exception as exc:
+            logger.error(f"Failed to check Zotero documents: {exc}")
+            return
 
-            new_count = 0
-            for item in zotero_items:
-                data = item.get('data', {})
+        new_count = len(new_items)
+        if new_count == 0:
+            return
 
-                if data.get('itemType') != 'attachment':
-                    continue
+        logger.info(f"✓ {new_count} new document(s) found in Zotero")
 
-                filename = data.get('filename') or data.get('title', '')
+        if not self.auto_sync:
+            logger.info(f"ℹ️  Use /zotero/sync/new to download (auto-sync disabled)")
+            return
 
-                if not filename.lower().endswith('.pdf'):
-                    continue
+        logger.info(f"🔄 Auto-syncing {new_count} document(s)...")
 
-                if filename and filename not in existing_filenames:
-                    logger.info(f"📋 New document found in Zotero: {filename}")
-                    new_count += 1
+        # Runs outside the poller session; the sync manages its own
+        try:
+            from .sync import ZoteroSyncService
+            sync_service = ZoteroSyncService()
 
-            if new_count > 0:
-                logger.info(f"✓ {new_count} new document(s) found in Zotero")
+            result = sync_service.sync_new_documents_only(new_items)
 
-                if self.auto_sync:
-                    logger.info(f"🔄 Auto-syncing {new_count} document(s)...")
+            synced = result.get('synced', 0)
+            failed = result.get('failed', 0)
+            skipped = result.get('skipped', 0)
 
-                    try:
-                        from .sync import ZoteroSyncService
-                        sync_service = ZoteroSyncService()
+            logger.info(f"✅ Auto-sync complete: {synced} queued, {skipped} skipped, {failed} failed")
 
-                        result = sync_service.sync_new_documents_only
+            if synced > 0:
+                logger.info(f"📢 {synced} document(s) queued for processing")
+                try:
+                    from services.ingest.worker import get_worker
+                    worker = get_worker()
+                    worker.trigger_check()
+                    logger.info(f"📢 Worker triggered: {synced} document(s) ready for processing")
+                except Exception as worker_exc:
+                    logger.warning(f"Failed to trigger worker: {worker_exc}")
 
-                        synced = result.get('synced', 0)
-                        failed = result.get('failed', 0)
-                        skipped = result.get('skipped', 0)
+        except Exception as sync_exc:
+            logger.error(f"❌ Auto-sync failed: {sync_exc}", exc_info=True)
 
-                        logger.info(f"✅ Auto-sync complete: {synced} queued, {skipped} skipped, {failed} failed")
+    def _find_new_items(self) -> List[Dict[str, Any]]:
+        from .sync import find_existing_filenames, pdf_attachment_filename
 
-                        if synced > 0:
-                            logger.info(f"📢 {synced} document(s) queued for processing")
-                            try:
-                                from services.ingest.worker import get_worker
-                                worker = get_worker()
-                                worker.trigger_check()
-                                logger.info(f"📢 Worker triggered: {synced} document(s) ready for processing")
-                            except Exception as worker_exc:
-                                logger.warning(f"Failed to trigger worker: {worker_exc}")
+        candidates = [
+            (filename, item)
+            for item in self.zotero.get_all_documents()
+            if (filename := pdf_attachment_filename(item))
+        ]
+        if not candidates:
+            return []
 
-                    except Exception as sync_exc:
-                        logger.error(f"❌ Auto-sync failed: {sync_exc}", exc_info=True)
-                else:
-                    logger.info(f"ℹ️  Use /zotero/sync/new to download (auto-sync disabled)")
+        with SessionLocal() as db:
+            existing_filenames = find_existing_filenames(db, (filename for filename, _ in candidates))
 
-        except Exception as exc:
-            logger.error(f"Failed to check Zotero documents: {exc}")
-            db.rollback()
-        finally:
-            db.close()
+        new_items = []
+        for filename, item in candidates:
+            if filename not in existing_filenames:
+                logger.info(f"📋 New document found in Zotero: {filename}")
+                new_items.append(item)
+        return new_items
 
 
 _poller: Optional[ZoteroPoller] = None
+_poller_lock = threading.Lock()
 
 
 def get_poller() -> ZoteroPoller:
     global _poller
     if _poller is None:
-        _poller = ZoteroPoller()
+        with _poller_lock:
+            if _poller is None:
+                _poller = ZoteroPoller()
     return _poller
\ No newline at end of file
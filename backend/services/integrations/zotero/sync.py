@@ -1,6 +1,8 @@
 import logging
 import os
-from typing import Dict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from persistence.models import Document
 from persistence.session import SessionLocal
@@ -13,12 +15,43 @@ from .client import ZoteroService
 
 logger = logging.getLogger(__name__)
 
+_FILENAME_QUERY_BATCH = 500
+_ZOTERO_PAGE_SIZE = 100
+_SYNC_COMMIT_BATCH = 50
+
+
+def pdf_attachment_filename(item: Dict) -> Optional[str]:
+    """Return the filename if ``item`` is a PDF attachment, else None."""
+    data = item.get('data', {})
+    if data.get('itemType') != 'attachment':
+        return None
+
+    filename = data.get('filename') or data.get('title', '')
+    # Lowercase only the extension instead of the whole filename
+    if filename[-4:].lower() != '.pdf':
+        return None
+    return filename
+
+
+def find_existing_filenames(db, filenames: Iterable[str]) -> Set[str]:
+    """Return the subset of ``filenames`` that already has a Document row."""
+    candidates = list(dict.fromkeys(filenames))
+    existing: Set[str] = set()
+    for start in range(0, len(candidates), _FILENAME_QUERY_BATCH):
+        batch = candidates[start:start + _FILENAME_QUERY_BATCH]
+        rows = db.query(Document.filename).filter(Document.filename.in_(batch)).all()
+        existing.update(row.filename for row in rows)
+    return existing
+
 
 class ZoteroSyncService:
 
     def __init__(self):
         self.zotero = ZoteroService.get_instance()
-        self.metadata_extractor = MetadataExtractor(use_llm=settings.use_llm_metadata_extraction)
+        self.metadata_extractor = MetadataExtractor(
+            use_llm=settings.use_llm_metadata_extraction,
+            cache_dir=settings.metadata_cache_dir
+        )
         self.embedding_service = EmbeddingService.get_instance()
         self.vector_store = VectorStoreService(self.embedding_service)
 
@@ -33,9 +66,37 @@ class ZoteroSyncService:
 
         logger.info("Starting Zotero sync...")
 
-        zotero_items = self.zotero.get_all_documents()
-        logger.info(f"Found {len(zotero_items)} items in Zotero")
+        db = SessionLocal()
+        try:
+            results = self._sync_items(self.zotero.iter_documents(), db)
+            db.commit()
+
+            logger.info(f"✅ Sync committed to database: {results['synced']} document(s) queued")
+
+        finally:
+            db.close()
+
+        logger.info(f"Sync complete: {results['synced']} synced, "
+                    f"{results['skipped']} skipped, {results['failed']} failed")
+
+        return results
+
 
+    def _find_new_items(self, db) -> List[Dict]:
+        new_items = []
+        items = self.zotero.iter_documents(page_size=_ZOTERO_PAGE_SIZE)
+        # Check against the DB page by page instead of holding the whole library
+        while page := list(islice(items, _ZOTERO_PAGE_SIZE)):
+            candidates = [
+                (filename, item) for item in page if (filename := pdf_attachment_filename(item))
+            ]
+
+            existing_filenames = find_existing_filenames(db, (filename for filename, _ in candidates))
+            new_items.extend(item for filename, item in candidates if filename not in existing_filenames)
+
+        return new_items
+
+    def _sync_items(self, zotero_items: Iterable[Dict], db) -> Dict[str, Any]:
         results = {
             'synced': 0,
             'skipped': 0,
@@ -43,45 +104,63 @@ class ZoteroSyncService:
             'details': []
         }
 
-        db = SessionLocal()
-        queued_count = 0
-        try:
-            for item in zotero_items:
-                try:
-                    result = self._sync_single_item(item, db)
-
-                    if result['status'] == 'queued':
-                        results['synced'] += 1
-                        queued_count += 1
-                    elif result['status'] == 'skipped':
-                        results['skipped'] += 1
-                    else:
-                        results['failed'] += 1
-
-                    results['details'].append(result)
-
-                except Exception as exc:
-                    logger.error(f"Failed to sync item: {exc}")
-                    results['failed'] += 1
-                    results['details'].append({
-                        'status': 'failed',
-                        'error': str(exc)
-                    })
+        pending: List[Dict[str, Any]] = []
+        planned_filenames: Set[str] = set()
+        for item in zotero_items:
+            try:
+                plan = self._check_item(item, db)
+            except Exception as exc:
+                logger.error(f"Failed to sync item: {exc}")
+                self._record_result(results, {'status': 'failed', 'error': str(exc)})
+                continue
+
+            if plan['status'] == 'pending' and plan['filename'] in planned_filenames:
+                plan = {
+                    'status': 'skipped',
+                    'reason': 'duplicate_filename',
+                    'item_key': plan['item_key'],
+                    'filename': plan['filename']
+                }
 
-            db.commit()
+            if plan['status'] == 'pending':
+                planned_filenames.add(plan['filename'])
+                pending.append(plan)
+            else:
+                self._record_result(results, plan)
 
-            logger.info(f"✅ Sync committed to database: {queued_count} document(s) queued")
+        if not pending:
+            return results
 
-        finally:
-            db.close()
+        download_dir = os.path.join(settings.data_dir, 'zotero_downloads')
+        os.makedirs(download_dir, exist_ok=True)
 
-        logger.info(f"Sync complete: {results['synced']} synced, "
-                    f"{results['skipped']} skipped, {results['failed']} failed")
+        # Downloads run in parallel, DB writes stay in the calling thread
+        max_workers = min(max(1, settings.zotero_download_concurrency), len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="zotero-download") as executor:
+            futures = {
+                executor.submit(self._download_item, plan['item_key'], plan['filename'], download_dir): plan
+                for plan in pending
+            }
+            for persisted, future in enumerate(as_completed(futures), start=1):
+                self._record_result(results, self._persist_item(futures[future], future.result(), db))
+                if persisted % _SYNC_COMMIT_BATCH == 0:
+                    db.commit()
 
+        db.commit()
         return results
 
+    @staticmethod
+    def _record_result(results: Dict[str, Any], result: Dict) -> None:
+        if result['status'] == 'queued':
+            results['synced'] += 1
+        elif result['status'] == 'skipped':
+            results['skipped'] += 1
+        else:
+            results['failed'] += 1
+
+        results['details'].append(result)
 
-    def _sync_single_item(self, zotero_item: Dict, db) -> Dict:
+    def _check_item(self, zotero_item: Dict, db) -> Dict:
         data = zotero_item.get('data', {})
         item_key = data.get('key')
         item_type = data.get('itemType')
@@ -95,7 +174,7 @@ class ZoteroSyncService:
 
         filename = data.get('filename') or data.get('title', 'unknown.pdf')
 
-        if not filename.lower().endswith('.pdf'):
+        if filename[-4:].lower() != '.pdf':
             return {
                 'status': 'skipped',
                 'reason': 'not_pdf',
@@ -117,43 +196,57 @@ class ZoteroSyncService:
                 'doc_id': existing.id
             }
 
-        try:
-            download_dir = os.path.join(settings.data_dir, 'zotero_downloads')
-            os.makedirs(download_dir, exist_ok=True)
-
-            logger.info(f"📥 Downloading from Zotero: {filename}")
-            file_path = self.zotero.download_document(item_key, download_dir)
-
-            if not file_path or not os.path.exists(file_path):
-                return {
-                    'status': 'failed',
-                    'reason': 'download_failed',
-                    'item_key': item_key,
-                    'filename': filename
-                }
+        return {
+            'status': 'pending',
+            'item_key': item_key,
+            'filename': filename,
+            'existing': existing
+        }
 
-            logger.info(f"✅ Downloaded: {file_path}")
+    def _download_item(self, item_key: str, filename: str, download_dir: str) -> Optional[str]:
+        logger.info(f"📥 Downloading from Zotero: {filename}")
+        file_path = self.zotero.download_document(item_key, download_dir)
 
-            if existing:
-                doc = existing
-                doc.file_path = file_path
-                doc.processed = False
-                doc.num_chunks = 0
-            else:
-                doc = Document(
-                    filename=filename,
-                    file_path=file_path,
-                    query_enabled=True,
-                    processed=False,
-                    num_chunks=0
-                )
-                db.add(doc)
-
-            db.flush()
-            logger.info(f"💾 Document entry created/updated: ID={doc.id}, collection={doc.collection_name}")
+        if not file_path or not os.path.exists(file_path):
+            return None
 
-            db.commit()
-            db.refresh(doc)
+        logger.info(f"✅ Downloaded: {file_path}")
+        return file_path
+
+    def _persist_item(self, plan: Dict[str, Any], file_path: Optional[str], db) -> Dict:
+        item_key = plan['item_key']
+        filename = plan['filename']
+        existing = plan['existing']
+
+        if not file_path:
+            return {
+                'status': 'failed',
+                'reason': 'download_failed',
+                'item_key': item_key,
+                'filename': filename
+            }
+
+        try:
+            # One savepoint per item; _sync_items commits in batches
+            with db.begin_nested():
+                if existing:
+                    doc = existing
+                    doc.file_path = file_path
+                    doc.processed = False
+                    doc.num_chunks = 0
+                    doc.processing_started_at = None
+                else:
+                    doc = Document(
+                        filename=filename,
+                        file_path=file_path,
+                        query_enabled=True,
+                        processed=False,
+                        num_chunks=0
+                    )
+                    db.add(doc)
+
+                db.flush()
+            logger.info(f"💾 Document entry created/updated: ID={doc.id}, collection={doc.collection_name}")
 
             return {
                 'status': 'queued',
@@ -166,7 +259,6 @@ class ZoteroSyncService:
 
         except Exception as exc:
             logger.error(f"Failed to sync {filename}: {exc}", exc_info=True)
-            db.rollback()
             return {
                 'status': 'failed',
                 'reason': str(exc),
@@ -174,61 +266,26 @@ class ZoteroSyncService:
                 'filename': filename
             }
 
-    @property
-    def sync_new_documents_only(self) -> Dict:
+    def sync_new_documents_only(self, new_items: Optional[List[Dict]] = None) -> Dict:
+        """Sync Zotero attachments not yet in the database.
 
+        Callers that already diffed Zotero against the database (the poller)
+        pass ``new_items`` to skip the second library fetch and lookup.
+        """
         if not self.zotero.is_enabled():
             return {'synced': 0, 'skipped': 0, 'failed': 0}
 
-        logger.info("Checking for new Zotero documents...")
-
         db = SessionLocal()
         try:
-            existing_filenames = {
-                doc.filename for doc in db.query(Document).all()
-            }
-
-            zotero_items = self.zotero.get_all_documents()
-            new_items = []
-
-            for item in zotero_items:
-                data = item.get('data', {})
-                if data.get('itemType') != 'attachment':
-                    continue
-
-                filename = data.get('filename') or data.get('title', '')
-                if filename and filename not in existing_filenames:
-                    new_items.append(item)
+            if new_items is None:
+                logger.info("Checking for new Zotero documents...")
+                new_items = self._find_new_items(db)
 
             logger.info(f"Found {len(new_items)} new documents in Zotero")
 
-            results = {
-                'synced': 0,
-                'skipped': 0,
-                'failed': 0,
-                'details': []
-            }
-
-            queued_count = 0
-            for item in new_items:
-                try:
-                    result = self._sync_single_item(item, db)
-
-                    if result['status'] == 'queued':
-                        results['synced'] += 1
-                        queued_count += 1
-                    elif result['status'] == 'skipped':
-                        results['skipped'] += 1
-                    else:
-                        results['failed'] += 1
-
-                    results['details'].append(result)
-
-                except Exception as exc:
-                    logger.error(f"Sync failed: {exc}")
-                    results['failed'] += 1
+            results = self._sync_items(new_items, db)
 
-            logger.info(f"✅ Sync committed to database: {queued_count} document(s) queued")
+            logger.info(f"✅ Sync committed to database: {results['synced']} document(s) queued")
 
             return results
 
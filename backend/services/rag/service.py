@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import logging
+import operator
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Any, Iterator, Callable, Optional, Tuple, Set
 
-from cachetools import TTLCache
+import numpy as np
 from langchain.schema import HumanMessage, SystemMessage, AIMessage
 from sqlalchemy.orm import Session
 
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
 from core.settings import settings
-from services.ingest.processor import DocumentProcessor, load_parent_document
+from services.ingest.processor import DocumentProcessor, load_parent_documents_bulk
 from core.llm import create_llm
 from core.reranker import RerankerService
 from core.vector_store import VectorStoreService
@@ -35,21 +39,139 @@ Return ONLY the 3 queries, one per line, without numbering or bullets."""
 
 ANSWER_GENERATION_SYSTEM_PROMPT = """You are a helpful assistant that answers questions based on the provided context. Use the context to answer the question accurately. If the context doesn't contain enough information to answer the question, say so."""
 
+# Constant prefix: providers with a prompt/KV cache (Ollama, vLLM with enable_prefix_caching,
+# OpenAI, Anthropic) can reuse it across requests
+_SYSTEM_MSG = SystemMessage(content=ANSWER_GENERATION_SYSTEM_PROMPT)
+
 MIN_ACCEPTABLE_SCORE = 0.4
 GOOD_SCORE = 0.5
 MAX_CHAT_HISTORY = 5
 
+ChunkKey = Tuple[Any, ...]
+
+# Pickle reads are I/O-bound: load several documents in parallel
+_parent_loader = ThreadPoolExecutor(max_workers=4, thread_name_prefix="parent-loader")
+
+
+def _collect_new_chunks(
+        chunks: List[Dict[str, Any]],
+        seen_chunk_keys: Set[ChunkKey],
+        target: List[Dict[str, Any]]
+) -> int:
+    seen_add = seen_chunk_keys.add
+    append = target.append
+    new_chunks = 0
+
+    for chunk in chunks:
+        chunk_key = (chunk.get('doc_id'), chunk.get('chunk_id'))
+        if chunk_key not in seen_chunk_keys:
+            seen_add(chunk_key)
+            append(chunk)
+            new_chunks += 1
+
+    return new_chunks
+
+
+class SemanticQueryCache:
+    """TTL cache for query expansions keyed by the normalized question text.
+
+    With ``semantic`` enabled, a miss falls back to embedding similarity so
+    near-identical phrasings share an entry. Embeddings live in one normalized
+    matrix so that lookup is a single matrix-vector product.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, threshold: float, semantic: bool = False):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self.semantic = semantic
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._values: List[Any] = []
+        self._inserted: List[float] = []
+        # Exact hits: normalized key -> absolute slot; position = slot - number of dropped entries
+        self._slots: Dict[str, int] = {}
+        self._dropped = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.casefold().split()).rstrip("?!. ")
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _drop_oldest(self, count: int) -> None:
+        if count <= 0:
+            return
+        if self._vectors is not None:
+            self._vectors = self._vectors[count:] if count < len(self._values) else None
+        for position, key in enumerate(self._keys[:count]):
+            # A later insert of the same key owns a newer slot
+            if self._slots.get(key) == self._dropped + position:
+                del self._slots[key]
+        self._dropped += min(count, len(self._keys))
+        del self._keys[:count]
+        del self._values[:count]
+        del self._inserted[:count]
+
+    def _expire(self, now: float) -> None:
+        # Entries are ordered by insertion time
+        cutoff = now - self.ttl
+        expired = 0
+        while expired < len(self._inserted) and self._inserted[expired] < cutoff:
+            expired += 1
+        self._drop_oldest(expired)
+
+    def get(self, query: str, embedding: Optional[np.ndarray] = None) -> Optional[Any]:
+        key = self.normalize_query(query)
+        with self._lock:
+            self._expire(time.monotonic())
+            slot = self._slots.get(key)
+            if slot is not None:
+                return self._values[slot - self._dropped]
+
+            if not self.semantic or embedding is None or self._vectors is None:
+                return None
+            scores = self._vectors @ self._normalize(embedding)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._values[best]
+
+    def put(self, query: str, value: Any, embedding: Optional[np.ndarray] = None) -> None:
+        vector = None
+        if self.semantic and embedding is not None:
+            vector = self._normalize(embedding)[np.newaxis, :]
+        with self._lock:
+            self._expire(time.monotonic())
+            self._drop_oldest(len(self._values) + 1 - self.maxsize)
+            if self.semantic:
+                if vector is None:
+                    # Every cached entry needs a row in the similarity matrix
+                    return
+                self._vectors = vector if self._vectors is None else np.vstack((self._vectors, vector))
+            key = self.normalize_query(query)
+            self._slots[key] = self._dropped + len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._inserted.append(time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._values)
+
 
 def _build_messages(
         query: str,
         contexts: List[str],
         chat_history: Optional[List[Dict[str, str]]] = None
 ) -> List[Any]:
-    context_str = "\n\n".join([f"Context {i + 1}:\n{ctx}" for i, ctx in enumerate(contexts)])
+    context_str = "\n\n".join(f"Context {i + 1}:\n{ctx}" for i, ctx in enumerate(contexts))
 
-    messages: List[Any] = [
-        SystemMessage(content=ANSWER_GENERATION_SYSTEM_PROMPT)
-    ]
+    messages: List[Any] = [_SYSTEM_MSG]
 
     if chat_history:
         for msg in chat_history[-MAX_CHAT_HISTORY:]:
@@ -67,8 +189,8 @@ def _build_messages(
 def _expand_parent_neighbors(
         base_entries: List[Dict[str, Any]],
         doc_cache: Dict[int, Optional[Document]],
-        doc_order_map: Dict[int, int],
-        seen_parents: Set[Tuple[int, int]]
+        seen_parents: Set[Tuple[int, int]],
+        parent_texts: Dict[Tuple[int, int], str]
 ) -> List[Dict[str, Any]]:
     limit = max(settings.top_k_rerank, 1)
 
@@ -86,65 +208,71 @@ def _expand_parent_neighbors(
         if len(expanded) >= limit:
             break
 
-        document = entry.get('document') or doc_cache.get(entry['doc_id'])
+        doc_id = entry['doc_id']
+        document = entry['document'] or doc_cache.get(doc_id)
         if not document or not document.pickle_path:
             continue
 
-        if len(expanded) < limit:
-            prev_key = (entry['doc_id'], entry['parent_id'] - 1)
-            if prev_key[1] >= 0 and prev_key not in seen_parents:
-                prev_text = load_parent_document(document.pickle_path, prev_key[1])
-                if prev_text:
-                    expanded.append({
-                        'doc_id': entry['doc_id'],
-                        'parent_id': prev_key[1],
-                        'document': document,
-                        'document_name': entry.get('document_name'),
-                        'section': entry.get('section', ''),
-                        'position': entry.get('position', ''),
-                        'score': max(entry.get('score', 0.0) * 0.95, 0.0),
-                        'text': prev_text,
-                        'is_neighbor': True,
-                        'neighbor_direction': -1,
-                        'doc_order': doc_order_map.setdefault(entry['doc_id'], len(doc_order_map)),
-                    })
-                    seen_parents.add(prev_key)
+        parent_id = entry['parent_id']
+        doc_order = entry['doc_order']
+        document_name = entry['document_name']
+        section = entry['section']
+        position = entry['position']
+        score = entry['score']
+
+        prev_key = (doc_id, parent_id - 1)
+        if prev_key[1] >= 0 and prev_key not in seen_parents:
+            prev_text = parent_texts.get(prev_key)
+            if prev_text:
+                expanded.append({
+                    'doc_id': doc_id,
+                    'parent_id': prev_key[1],
+                    'document': document,
+                    'document_name': document_name,
+                    'section': section,
+                    'position': position,
+                    'score': max(score * 0.95, 0.0),
+                    'text': prev_text,
+                    'is_neighbor': True,
+                    'neighbor_direction': -1,
+                    'doc_order': doc_order,
+                    '_sort_key': (doc_order, prev_key[1]),
+                })
+                seen_parents.add(prev_key)
 
         for offset in range(1, window + 1):
             if len(expanded) >= limit:
                 break
 
-            next_key = (entry['doc_id'], entry['parent_id'] + offset)
+            next_key = (doc_id, parent_id + offset)
             if next_key in seen_parents:
                 continue
 
-            next_text = load_parent_document(document.pickle_path, next_key[1])
+            next_text = parent_texts.get(next_key)
             if not next_text:
                 continue
 
             expanded.append({
-                'doc_id': entry['doc_id'],
+                'doc_id': doc_id,
                 'parent_id': next_key[1],
                 'document': document,
-                'document_name': entry.get('document_name'),
-                'section': entry.get('section', ''),
-                'position': entry.get('position', ''),
-                'score': max(entry.get('score', 0.0) * 0.98, 0.0),
+                'document_name': document_name,
+                'section': section,
+                'position': position,
+                'score': max(score * 0.98, 0.0),
                 'text': next_text,
                 'is_neighbor': True,
                 'neighbor_direction': 1,
-                'doc_order': doc_order_map.setdefault(entry['doc_id'], len(doc_order_map)),
+                'doc_order': doc_order,
+                '_sort_key': (doc_order, next_key[1]),
             })
             seen_parents.add(next_key)
 
-    reorder = any(entry.get('is_neighbor') for entry in expanded)
+    reorder = any(entry['is_neighbor'] for entry in expanded)
     if reorder:
-        expanded.sort(key=lambda item: (
-            item.get('doc_order', 0),
-            item.get('parent_id', 0)
-        ))
+        expanded.sort(key=operator.itemgetter('_sort_key'))
     else:
-        expanded.sort(key=lambda item: item.get('score', 0.0), reverse=True)
+        expanded.sort(key=operator.itemgetter('score'), reverse=True)
 
     return expanded[:limit]
 
@@ -155,10 +283,23 @@ def _load_parents_from_chunks(
 ) -> Tuple[List[str], List[Dict[str, str]]]:
     entries: List[Dict[str, Any]] = []
     seen_parents: Set[Tuple[int, int]] = set()
-    doc_cache: Dict[int, Optional[Document]] = {}
     doc_order_map: Dict[int, int] = {}
     limit = max(settings.top_k_rerank, 1)
 
+    # Pass 1: collect candidates and the parent IDs needed (incl. neighbors) per pickle file
+    candidates: List[Tuple[Dict[str, Any], Document]] = []
+    candidate_keys: Set[Tuple[int, int]] = set()
+    ids_by_doc: Dict[int, Set[int]] = {}
+    expand = settings.enable_neighbor_expansion and settings.neighbor_expansion_window > 0
+    window = settings.neighbor_expansion_window
+
+    # Load all documents with one query instead of one per doc_id
+    chunk_doc_ids = {chunk.get('doc_id') for chunk in chunks} - {None}
+    doc_cache: Dict[int, Optional[Document]] = {
+        document.id: document
+        for document in db.query(Document).filter(Document.id.in_(chunk_doc_ids)).all()
+    } if chunk_doc_ids else {}
+
     for chunk in chunks:
         doc_id = chunk.get('doc_id')
         parent_id = chunk.get('parent_id')
@@ -166,36 +307,57 @@ def _load_parents_from_chunks(
             continue
 
         parent_key = (doc_id, parent_id)
-        if parent_key in seen_parents:
+        if parent_key in candidate_keys:
             continue
 
         document = doc_cache.get(doc_id)
-        if document is None:
-            document = db.query(Document).filter(Document.id == doc_id).first()
-            doc_cache[doc_id] = document
-
         if not document or not document.pickle_path:
             continue
 
-        parent_text = load_parent_document(
-            document.pickle_path,
-            parent_id,
-        )
+        candidate_keys.add(parent_key)
+        candidates.append((chunk, document))
+        wanted = ids_by_doc.setdefault(doc_id, set())
+        if expand:
+            wanted.update(range(parent_id - 1, parent_id + window + 1))
+        else:
+            wanted.add(parent_id)
+
+    # Open each pickle file only once, different documents in parallel
+    parent_texts: Dict[Tuple[int, int], str] = {}
+    doc_ids = list(ids_by_doc)
+    pickle_paths = [doc_cache[doc_id].pickle_path for doc_id in doc_ids]
+    if len(doc_ids) > 1:
+        loaded_per_doc = _parent_loader.map(load_parent_documents_bulk, pickle_paths, ids_by_doc.values())
+    else:
+        loaded_per_doc = map(load_parent_documents_bulk, pickle_paths, ids_by_doc.values())
+    for doc_id, loaded in zip(doc_ids, loaded_per_doc):
+        parent_texts.update(((doc_id, parent_id), text) for parent_id, text in loaded.items())
+
+    # Pass 2: build entries from the loaded texts
+    for chunk, document in candidates:
+        doc_id = chunk['doc_id']
+        parent_id = chunk['parent_id']
+        parent_key = (doc_id, parent_id)
+
+        parent_text = parent_texts.get(parent_key)
         if not parent_text:
             continue
 
+        doc_order = doc_order_map.setdefault(doc_id, len(doc_order_map))
+        chunk_get = chunk.get
         entry = {
             'doc_id': doc_id,
             'parent_id': parent_id,
             'document': document,
-            'document_name': chunk.get('document_name') or document.filename,
-            'section': chunk.get('section', ''),
-            'position': chunk.get('position', ''),
-            'score': chunk.get('rerank_score', 0.0),
+            'document_name': chunk_get('document_name') or document.filename,
+            'section': chunk_get('section', ''),
+            'position': chunk_get('position', ''),
+            'score': chunk_get('rerank_score', 0.0),
             'text': parent_text,
             'is_neighbor': False,
             'neighbor_direction': 0,
-            'doc_order': doc_order_map.setdefault(doc_id, len(doc_order_map)),
+            'doc_order': doc_order,
+            '_sort_key': (doc_order, parent_id),
         }
 
         entries.append(entry)
@@ -204,19 +366,21 @@ def _load_parents_from_chunks(
         if len(entries) >= limit:
             break
 
-    final_entries = _expand_parent_neighbors(entries, doc_cache, doc_order_map, seen_parents)
+    final_entries = _expand_parent_neighbors(entries, doc_cache, seen_parents, parent_texts)
 
     parent_contexts = [entry['text'] for entry in final_entries]
     sources: List[Dict[str, str]] = []
 
     for entry in final_entries:
-        section = entry.get('section', '')
-        label_parts = [entry.get('document_name', 'Document')]
+        section = entry['section']
+        document_name = entry['document_name']
+        score = entry['score']
+        label_parts = [document_name]
         if section and section not in ("Unknown", "Introduction"):
             label_parts.append(f"§ {section}")
 
-        if entry.get('is_neighbor'):
-            direction = entry.get('neighbor_direction', 0)
+        if entry['is_neighbor']:
+            direction = entry['neighbor_direction']
             if direction > 0:
                 label_parts.append("Folgeabschnitt")
             elif direction < 0:
@@ -224,13 +388,12 @@ def _load_parents_from_chunks(
             else:
                 label_parts.append("Nachbarabschnitt")
 
-        score = entry.get('score', 0.0)
         label_parts.append(f"(Relevanz: {score:.0%})")
 
         sources.append({
             "label": " - ".join(label_parts),
             "content": entry['text'].strip(),
-            "document": entry.get('document_name', 'Document'),
+            "document": document_name,
             "section": section,
             "score": f"{score:.3f}"
         })
@@ -251,13 +414,20 @@ class RAGService:
 
         self.llm = create_llm(streaming=True, max_tokens=4096)
         self.llm_sync = create_llm(streaming=False, max_tokens=1024)
+        self._speculative_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-speculative")
 
-        self.query_expansion_cache = TTLCache(
+        self.query_expansion_cache = SemanticQueryCache(
             maxsize=settings.query_expansion_cache_size,
-            ttl=settings.query_expansion_cache_ttl
+            ttl=settings.query_expansion_cache_ttl,
+            threshold=settings.query_expansion_similarity_threshold,
+            semantic=settings.query_expansion_semantic_cache
+        )
+        match_mode = (
+            f"similarity >= {settings.query_expansion_similarity_threshold}"
+            if settings.query_expansion_semantic_cache else "exact match"
         )
         logger.info(f"Query expansion cache enabled: {settings.query_expansion_cache_size} entries, "
-                   f"TTL={settings.query_expansion_cache_ttl}s")
+                   f"TTL={settings.query_expansion_cache_ttl}s, {match_mode}")
 
     def _generate_queries_from_llm(
         self,
@@ -273,10 +443,22 @@ class RAGService:
             logger.warning(f"{round_name} query generation failed: {exc}")
             return [original_query]
 
+    def _generate_alternative_queries(self, original_query: str) -> List[str]:
+        messages = [
+            SystemMessage(content=ALTERNATIVE_QUERIES_PROMPT),
+            HumanMessage(content=f"Original question: {original_query}")
+        ]
+        return self._generate_queries_from_llm(messages, original_query, "Round 2")
+
     def generate_query_variations(self, original_query: str) -> List[str]:
-        if original_query in self.query_expansion_cache:
+        query_embedding = None
+        if self.query_expansion_cache.semantic:
+            # The embedding lands in the embedding service LRU and is reused by the search
+            query_embedding = self.vector_store.embedding_service.embed_text(original_query)
+        cached = self.query_expansion_cache.get(original_query, query_embedding)
+        if cached is not None:
             logger.debug(f"Query expansion cache hit for: {original_query[:50]}...")
-            return self.query_expansion_cache[original_query]
+            return cached
 
         messages = [
             SystemMessage(content=QUERY_EXPANSION_PROMPT),
@@ -288,7 +470,7 @@ class RAGService:
 
         while len(result) < 3:
             result.append(original_query)
-        self.query_expansion_cache[original_query] = result
+        self.query_expansion_cache.put(original_query, result, query_embedding)
         return result
 
     def retrieve_for_query(
@@ -305,7 +487,7 @@ class RAGService:
     def _inject_metadata_chunks(
             self,
             chunks: List[Dict[str, Any]],
-            seen_chunk_keys: Set[str],
+            seen_chunk_keys: Set[ChunkKey],
             emit_thinking: Optional[Callable] = None,
             doc_collection_map: Optional[Dict[int, str]] = None
     ) -> List[Dict[str, Any]]:
@@ -320,11 +502,15 @@ class RAGService:
             if chunk.get('section') == 'Document Metadata'
         }
 
+        # Only query documents whose metadata chunk is still missing
         subset = {
             doc_id: doc_collection_map[doc_id]
             for doc_id in doc_ids
-            if doc_id in doc_collection_map
+            if doc_id in doc_collection_map and doc_id not in docs_with_metadata
         }
+        if not subset:
+            return chunks
+
         metadata_chunks = self.vector_store.get_metadata_chunks_for_docs(subset)
 
         if not metadata_chunks:
@@ -336,7 +522,7 @@ class RAGService:
             if doc_id in docs_with_metadata:
                 continue
 
-            chunk_key = f"meta_{doc_id}_{meta_chunk.get('chunk_id')}"
+            chunk_key = ("meta", doc_id, meta_chunk.get('chunk_id'))
             if chunk_key not in seen_chunk_keys:
                 meta_chunk['metadata_priority'] = True
                 seen_chunk_keys.add(chunk_key)
@@ -355,31 +541,26 @@ class RAGService:
     def _search_with_queries(
             self,
             queries: List[str],
-            seen_chunk_keys: Set[str],
+            seen_chunk_keys: Set[ChunkKey],
             emit_thinking: Callable,
             round_name: str = "",
             doc_collection_map: Optional[Dict[int, str]] = None
-    ) -> Tuple[List[Dict[str, Any]], Set[str]]:
+    ) -> Tuple[List[Dict[str, Any]], Set[ChunkKey]]:
         all_chunks: List[Dict[str, Any]] = []
+        prefix = f"{round_name} " if round_name else ""
 
         for i, query in enumerate(queries):
-            prefix = f"{round_name} " if round_name else ""
             display_query = f'"{query[:80]}..."' if len(query) > 80 else f'"{query}"'
             emit_thinking("searching", f"{prefix}Query {i + 1}: {display_query}")
 
             if not doc_collection_map:
-                break
-
-            chunks = self.retrieve_for_query(query, doc_collection_map)
-            new_chunks = 0
+                return all_chunks, seen_chunk_keys
 
-            for chunk in chunks:
-                chunk_key = f"{chunk.get('doc_id')}_{chunk.get('chunk_id')}"
-                if chunk_key not in seen_chunk_keys:
-                    seen_chunk_keys.add(chunk_key)
-                    all_chunks.append(chunk)
-                    new_chunks += 1
+        # Search all variations at once, evaluate in input order
+        results = self.vector_store.search_many(queries, doc_collection_map, top_k=settings.top_k_retrieval)
 
+        for i, chunks in enumerate(results):
+            new_chunks = _collect_new_chunks(chunks, seen_chunk_keys, all_chunks)
             emit_thinking(
                 "search_complete",
                 f"{prefix}Query {i + 1}: {len(chunks)} results, {new_chunks} new unique chunks"
@@ -395,7 +576,7 @@ class RAGService:
             on_thinking: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Tuple[List[str], List[Dict[str, str]], List[Dict[str, Any]]]:
         thinking_steps: List[Dict[str, Any]] = []
-        seen_chunk_keys: Set[str] = set()
+        seen_chunk_keys: Set[ChunkKey] = set()
         accumulated_chunks: List[Dict[str, Any]] = []
 
         def emit_thinking(step_type: str, message: str, details: Any = None):
@@ -404,9 +585,38 @@ class RAGService:
             if on_thinking:
                 on_thinking(step)
 
+        speculative_futures: List[Future] = []
+        try:
+            return self._retrieve_rounds(
+                original_query, db, doc_collection_map, thinking_steps, seen_chunk_keys,
+                accumulated_chunks, emit_thinking, speculative_futures
+            )
+        finally:
+            for future in speculative_futures:
+                future.cancel()
+
+    def _retrieve_rounds(
+            self,
+            original_query: str,
+            db: Session,
+            doc_collection_map: Dict[int, str],
+            thinking_steps: List[Dict[str, Any]],
+            seen_chunk_keys: Set[ChunkKey],
+            accumulated_chunks: List[Dict[str, Any]],
+            emit_thinking: Callable,
+            speculative_futures: List[Future]
+    ) -> Tuple[List[str], List[Dict[str, str]], List[Dict[str, Any]]]:
         emit_thinking("start", "Starting iterative multi-query retrieval...")
         emit_thinking("round1_start", "Round 1: Generating 3 query variations...")
 
+        # Search the original question while the LLM generates the variations
+        original_future: Optional[Future] = None
+        if doc_collection_map:
+            original_future = self._speculative_executor.submit(
+                self.retrieve_for_query, original_query, doc_collection_map
+            )
+            speculative_futures.append(original_future)
+
         query_variations = self.generate_query_variations(original_query)
         emit_thinking("queries_generated", "Generated queries", query_variations)
 
@@ -414,8 +624,23 @@ class RAGService:
             emit_thinking("no_documents", "No active document collections selected")
             return [], [], thinking_steps
 
+        # Round 2 queries only depend on the question; generate them while Round 1 searches.
+        # Submitted after the expansion call so both LLM requests never compete.
+        round2_future: Optional[Future] = None
+        if settings.rag_speculative_retry:
+            round2_future = self._speculative_executor.submit(self._generate_alternative_queries, original_query)
+            speculative_futures.append(round2_future)
+
+        original_chunks = original_future.result()
+        new_chunks = _collect_new_chunks(original_chunks, seen_chunk_keys, accumulated_chunks)
+        emit_thinking(
+            "search_complete",
+            f"Round 1 original question: {len(original_chunks)} results, {new_chunks} new unique chunks"
+        )
+
+        remaining_variations = [query for query in query_variations if query != original_query]
         round1_chunks, seen_chunk_keys = self._search_with_queries(
-            query_variations, seen_chunk_keys, emit_thinking, "Round 1", doc_collection_map
+            remaining_variations, seen_chunk_keys, emit_thinking, "Round 1", doc_collection_map
         )
         accumulated_chunks.extend(round1_chunks)
 
@@ -431,7 +656,7 @@ class RAGService:
         else:
             emit_thinking("round1_reranking", f"Reranking {len(accumulated_chunks)} chunks...")
             reranked = self.reranker.rerank(
-                original_query, accumulated_chunks, top_k=settings.top_k_rerank
+                original_query, accumulated_chunks, top_k=settings.top_k_rerank, reuse_scores=True
             )
             round1_best_score = reranked[0].get('rerank_score', 0) if reranked else 0
 
@@ -453,7 +678,7 @@ class RAGService:
         if round1_best_score < MIN_ACCEPTABLE_SCORE:
             reranked = self._run_retry_round(
                 original_query, accumulated_chunks, seen_chunk_keys,
-                emit_thinking, doc_collection_map, round1_best_score
+                emit_thinking, doc_collection_map, round1_best_score, round2_future
             )
 
         else:
@@ -462,7 +687,7 @@ class RAGService:
                 f"Acceptable quality (score: {round1_best_score:.3f}), no retry needed"
             )
             reranked = self.reranker.rerank(
-                original_query, accumulated_chunks, top_k=settings.top_k_rerank
+                original_query, accumulated_chunks, top_k=settings.top_k_rerank, reuse_scores=True
             )
 
         if not reranked:
@@ -480,22 +705,21 @@ class RAGService:
             self,
             original_query: str,
             accumulated_chunks: List[Dict[str, Any]],
-            seen_chunk_keys: Set[str],
+            seen_chunk_keys: Set[ChunkKey],
             emit_thinking: Callable,
             doc_collection_map: Dict[int, str],
-            round1_best_score: float
+            round1_best_score: float,
+            round2_future: Optional[Future] = None
     ) -> List[Dict[str, Any]]:
         emit_thinking(
             "round2_start",
             f"Round 2: Score {round1_best_score:.3f} < {MIN_ACCEPTABLE_SCORE}, trying alternative formulations..."
         )
 
-        messages = [
-            SystemMessage(content=ALTERNATIVE_QUERIES_PROMPT),
-            HumanMessage(content=f"Original question: {original_query}")
-        ]
-
-        round2_queries = self._generate_queries_from_llm(messages, original_query, "Round 2")
+        if round2_future is not None:
+            round2_queries = round2_future.result()
+        else:
+            round2_queries = self._generate_alternative_queries(original_query)
 
         emit_thinking("round2_queries", "Generated alternative queries", round2_queries)
 
@@ -516,7 +740,7 @@ class RAGService:
 
         emit_thinking("round2_reranking", f"Reranking all {len(accumulated_chunks)} accumulated chunks...")
         reranked = self.reranker.rerank(
-            original_query, accumulated_chunks, top_k=settings.top_k_rerank
+            original_query, accumulated_chunks, top_k=settings.top_k_rerank, reuse_scores=True
         )
         round2_best_score = reranked[0].get('rerank_score', 0) if reranked else 0
 
@@ -544,7 +768,7 @@ class RAGService:
             original_query: str,
             accumulated_chunks: List[Dict[str, Any]],
             reranked: List[Dict[str, Any]],
-            seen_chunk_keys: Set[str],
+            seen_chunk_keys: Set[ChunkKey],
             emit_thinking: Callable,
             doc_collection_map: Dict[int, str],
             improvement: float
@@ -580,7 +804,7 @@ class RAGService:
         emit_thinking("round3_reranking", f"Final reranking of all {len(accumulated_chunks)} chunks...")
 
         reranked = self.reranker.rerank(
-            original_query, accumulated_chunks, top_k=settings.top_k_rerank
+            original_query, accumulated_chunks, top_k=settings.top_k_rerank, reuse_scores=True
         )
         round3_best_score = reranked[0].get('rerank_score', 0) if reranked else 0
 